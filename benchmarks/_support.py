@@ -0,0 +1,33 @@
+from typing import Any
+
+import tornado.web
+from tornado.httputil import HTTPHeaders, HTTPServerRequest
+
+
+class _Connection:
+    def set_close_callback(self, callback: Any) -> None:
+        pass
+
+
+def make_request(
+    method: str = "GET",
+    uri: str = "/",
+    headers: dict = None,
+    body: bytes = b"",
+) -> HTTPServerRequest:
+    return HTTPServerRequest(
+        method=method,
+        uri=uri,
+        headers=HTTPHeaders(headers or {}),
+        body=body,
+        connection=_Connection(),
+    )
+
+
+def make_handler(
+    handler_class: Any,
+    request: HTTPServerRequest = None,
+    **kwargs: Any,
+) -> tornado.web.RequestHandler:
+    application = tornado.web.Application()
+    return handler_class(application, request or make_request(), **kwargs)
@@ -0,0 +1,49 @@
+from datetime import datetime
+from decimal import Decimal
+
+from tornado_restful.codecs import get_codecs
+
+
+def _payload(size):
+    results = [
+        {
+            "id": i,
+            "name": f"user{i}",
+            "email": f"user{i}@example.com",
+            "is_active": bool(i % 2),
+            "balance": Decimal("1024.50"),
+            "created_at": datetime(2020, 1, 1, 12, 0, 0),
+            "tags": ["a", "b", "c"],
+        } for i in range(size)
+    ]
+    return {"total": size, "results": results}
+
+
+def _codecs():
+    seen = set()
+    for media_type, codec in sorted(get_codecs().items()):
+        if id(codec) not in seen:
+            seen.add(id(codec))
+            yield media_type.split("/")[-1], codec
+
+
+def bench_encode():
+    for size in (1, 100, 10000):
+        payload = _payload(size)
+        for name, codec in _codecs():
+            yield f"{name},n={size}", lambda c=codec: c.encode(payload)
+
+
+def bench_decode():
+    for size in (1, 100, 10000):
+        payload = _payload(size)
+        for name, codec in _codecs():
+            data = codec.encode(payload)
+            yield f"{name},n={size}", lambda c=codec, d=data: c.decode(d)
+
+
+if __name__ == "__main__":
+    for size in (1, 100, 10000):
+        payload = _payload(size)
+        for name, codec in _codecs():
+            print(f"{name:<8} n={size:<6} {len(codec.encode(payload)):>10} B")
@@ -0,0 +1,42 @@
+import json
+
+from tornado_restful.handlers import APIHandler
+
+from benchmarks._support import make_handler, make_request
+
+
+def _payload(size):
+    results = [
+        {
+            "id": i,
+            "name": f"user{i}",
+            "email": f"user{i}@example.com",
+            "is_active": bool(i % 2),
+            "tags": ["a", "b", "c"],
+        } for i in range(size)
+    ]
+    return {"total": size, "results": results}
+
+
+def bench_write():
+    for size in (1, 100, 10000):
+        handler = make_handler(APIHandler)
+        payload = _payload(size)
+
+        def func(handler=handler, payload=payload):
+            handler.write(payload)
+            handler._write_buffer.clear()
+
+        yield f"n={size}", func
+
+
+def bench_parse_request_body():
+    for size in (1, 100, 10000):
+        body = json.dumps(_payload(size)["results"]).encode("utf-8")
+        request = make_request(
+            "POST",
+            headers={"Content-Type": "application/json"},
+            body=body,
+        )
+        handler = make_handler(APIHandler, request)
+        yield f"n={size}", handler._parse_request_body
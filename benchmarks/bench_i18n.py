@@ -0,0 +1,29 @@
+import json
+import os
+import tempfile
+
+from tornado_restful.i18n import I18n, load_translations
+
+
+def _load():
+    path = tempfile.mkdtemp()
+    messages = {
+        "errors": {
+            "not_found": "{name} was not found.",
+            "invalid": "Invalid value.",
+        }
+    }
+    for locale in ("en", "zh_CN", "fr"):
+        with open(os.path.join(path, f"{locale}.json"), "w") as f:
+            f.write(json.dumps(messages))
+    load_translations(path)
+
+
+def bench_translate():
+    _load()
+    exact = I18n("zh_CN")
+    fallback = I18n("de-DE")
+    yield "exact", lambda: exact.translate("errors.invalid")
+    yield "fallback", lambda: fallback.translate("errors.invalid")
+    yield "kwargs", lambda: exact.translate("errors.not_found", name="User")
+    yield "missing", lambda: exact.translate("errors.missing")
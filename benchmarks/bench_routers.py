@@ -0,0 +1,47 @@
+import tornado.web
+
+from tornado_restful.handlers import APIHandler
+from tornado_restful.routers import NestedRouter
+
+from benchmarks._support import make_request
+
+
+class ResourceHandler(APIHandler):
+    async def list(self):
+        pass
+
+    async def create(self):
+        pass
+
+    async def retrieve(self, **kwargs):
+        pass
+
+    async def update(self, **kwargs):
+        pass
+
+    async def destroy(self, **kwargs):
+        pass
+
+
+def _router(size):
+    router = NestedRouter(api_prefix="/api")
+    for i in range(size):
+        router.register(f"resources{i}", ResourceHandler)
+        router.register((f"resources{i}", "children"), ResourceHandler)
+    return router
+
+
+def bench_get_rules():
+    for size in (10, 1000):
+        yield f"n={size}", _router(size).get_rules
+
+
+def bench_dispatch():
+    for size in (10, 1000):
+        application = tornado.web.Application(_router(size).rules)
+        first = make_request(uri="/api/resources0/1")
+        last = make_request(uri=f"/api/resources{size - 1}/1/children/2")
+        for label, request in (("first", first), ("last", last)):
+            yield f"n={size},{label}", (
+                lambda a=application, r=request: a.find_handler(r)
+            )
@@ -0,0 +1,46 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+from tornado_restful.serializers import Serializer, fields, validate
+
+
+class UserSerializer(Serializer):
+    id = fields.Int(dump_only=True)
+    name = fields.Str(required=True, validate=validate.Length(min=2, max=20))
+    email = fields.Email(required=True)
+    is_active = fields.Bool()
+    created_at = fields.DateTime()
+
+
+def _objects(size):
+    return [
+        SimpleNamespace(
+            id=i,
+            name=f"user{i}",
+            email=f"user{i}@example.com",
+            is_active=bool(i % 2),
+            created_at=datetime(2020, 1, 1, 12, 0, 0),
+        ) for i in range(size)
+    ]
+
+
+def bench_dump():
+    for size in (1, 100, 10000):
+        objects = _objects(size)
+
+        def func(objects=objects):
+            return UserSerializer(objects, many=True).data
+
+        yield f"n={size}", func
+
+
+def bench_load():
+    for size in (1, 100, 10000):
+        data = UserSerializer(many=True).dump(_objects(size))
+
+        def func(data=data):
+            serializer = UserSerializer(data=data, many=True)
+            serializer.is_valid(raise_exception=True)
+            return serializer.validated_data
+
+        yield f"n={size}", func
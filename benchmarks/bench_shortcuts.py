@@ -0,0 +1,20 @@
+from tornado_restful.conf import settings
+from tornado_restful.shortcuts import (
+    generate_json_web_token,
+    parse_json_web_token,
+)
+from tornado_restful.utils import AESCipher
+
+
+def bench_parse_json_web_token():
+    token = generate_json_web_token({"sub": 1, "name": "user"})
+    yield "", lambda: parse_json_web_token(token)
+
+
+def bench_aes_cipher():
+    cipher = AESCipher(settings.secret_key[:16].encode("utf-8"))
+    for size in (16, 1024):
+        plaintext = "x" * size
+        ciphertext = cipher.encrypt(plaintext)
+        yield f"encrypt,n={size}", lambda p=plaintext: cipher.encrypt(p)
+        yield f"decrypt,n={size}", lambda c=ciphertext: cipher.decrypt(c)
@@ -0,0 +1,130 @@
+"""Check the import time of the package modules against a budget.
+
+    $ python -m benchmarks.importtime             # report and check budgets
+    $ python -m benchmarks.importtime --repeat 9  # more samples per module
+    $ python -m benchmarks.importtime --path ../old-checkout --save
+    $ python -m benchmarks.importtime --compare   # flag regressions
+
+Every module is imported in a fresh interpreter with ``-X importtime`` and
+the cumulative time of its top-level import is taken, the fastest of the
+samples is compared against ``BUDGETS`` and, with ``--compare``, against a
+baseline measured on the same machine (e.g. of another checkout).
+"""
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, Iterable
+
+from benchmarks.run import (
+    BASE_DIR,
+    DEFAULT_THRESHOLD,
+    compare,
+    load_results,
+    save_results,
+)
+
+# Fastest of 20-25 imports in milliseconds over three runs, CPython 3.11
+# on Linux x86-64 with the dependencies of Pipfile.lock. "before" is the
+# baseline tree measured with `--path`, "after" is this tree with lazy
+# settings, database and optional dependencies:
+#
+#   module                         before     after    budget
+#   tornado_restful               1.2-1.8   1.2-1.3         2
+#   tornado_restful.conf              2.7   2.6-2.9         4
+#   tornado_restful.models        199-233   155-171       180
+#   tornado_restful.serializers   311-373   156-178       190
+#   tornado_restful.routers       102-119   112-125       135
+#   tornado_restful.handlers      107-147   122-160       170
+#
+# The budgets sit just above the "after" numbers, importing the models or
+# `Crypto` eagerly again exceeds them. The routers and handlers now load
+# the middleware, codecs, events and tasks modules and stay slower than
+# before. `--compare` against a baseline saved on the same machine catches
+# smaller regressions.
+BUDGETS = {
+    "tornado_restful": 2,
+    "tornado_restful.conf": 4,
+    "tornado_restful.models": 180,
+    "tornado_restful.serializers": 190,
+    "tornado_restful.routers": 135,
+    "tornado_restful.handlers": 170,
+}
+DEFAULT_BASELINE = os.path.join(
+    BASE_DIR, "results", "importtime-baseline.json"
+)
+
+
+def measure(module: str, path: str = None) -> float:
+    env = dict(os.environ)
+    env.setdefault("TORNADO_SETTINGS_MODULE", "benchmarks.settings")
+    if path is not None:
+        # The settings module of another checkout may be missing, the
+        # package itself is still imported from `path` first.
+        env["PYTHONPATH"] = os.pathsep.join(
+            x for x in (env.get("PYTHONPATH"), os.path.dirname(BASE_DIR)) if x
+        )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=path,
+        env=env,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    for line in proc.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        _, _, fields = line.partition("import time:")
+        parts = [x.strip() for x in fields.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1]) / 1000
+    raise AssertionError(f"No import time reported for {module}.")
+
+
+def run(modules: Iterable[str], repeat: int,
+        path: str = None) -> Dict[str, dict]:
+    return {
+        module: {
+            "min": min(measure(module, path) for _ in range(repeat))
+        }
+        for module in modules
+    }
+
+
+def main(argv: Iterable[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--path", help="measure the checkout in PATH instead of this one"
+    )
+    parser.add_argument(
+        "--save", nargs="?", const=DEFAULT_BASELINE, metavar="PATH"
+    )
+    parser.add_argument(
+        "--compare", nargs="?", const=DEFAULT_BASELINE, metavar="PATH"
+    )
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    results = run(BUDGETS, args.repeat, args.path)
+    failed = 0
+    for module, result in results.items():
+        elapsed, budget = result["min"], BUDGETS[module]
+        flag = "OVER BUDGET" if elapsed > budget else "ok"
+        failed += elapsed > budget
+        print(f"{module:<40}{elapsed:>9.1f} ms / {budget:>4} ms  {flag}")
+    if args.save:
+        save_results(args.save, results)
+        print(f"\nBaseline saved to {args.save}")
+    if args.compare:
+        regressions = compare(
+            load_results(args.compare), results, args.threshold
+        )
+        for name, change in sorted(regressions.items()):
+            print(f"REGRESSION {name}: {change:+.1%}")
+        failed += len(regressions)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
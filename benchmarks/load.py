@@ -0,0 +1,309 @@
+"""End-to-end load harness for a full router/handler/serializer stack.
+
+    $ python -m benchmarks.load --concurrency 32 --duration 10
+    $ python -m benchmarks.load --save
+    $ python -m benchmarks.load --compare --threshold 0.15
+
+Boots ``benchmarks.loadapp`` through ``get_routes`` with the models bound to
+an in-memory SQLite database, then drives every scenario over the loopback
+interface with keep-alive asyncio clients. Must be run from the repository
+root, like ``get_routes`` itself.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import sys
+import time
+from contextlib import asynccontextmanager
+from inspect import isclass
+from typing import (
+    Any,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
+
+os.environ.setdefault("TORNADO_SETTINGS_MODULE", "benchmarks.settings")
+
+import peewee  # NOQA: E402
+import tornado.web  # NOQA: E402
+from tornado.httpserver import HTTPServer  # NOQA: E402
+from tornado.netutil import bind_sockets  # NOQA: E402
+
+from tornado_restful.handlers import NotFoundHandler  # NOQA: E402
+from tornado_restful.shortcuts import get_routes  # NOQA: E402
+
+from benchmarks.loadapp.models import Item  # NOQA: E402
+from benchmarks.run import (  # NOQA: E402
+    BASE_DIR,
+    DEFAULT_THRESHOLD,
+    compare,
+    load_results,
+    save_results,
+)
+
+DEFAULT_BASELINE = os.path.join(BASE_DIR, "results", "load-baseline.json")
+
+
+class SQLiteManager:
+    """A synchronous stand-in for the parts of ``peewee_async.Manager`` the
+    handlers use, backed by a local SQLite database."""
+    def __init__(self, database: peewee.SqliteDatabase) -> None:
+        self.database = database
+
+    async def execute(self, query: Any) -> Any:
+        if isinstance(query, peewee.SelectBase):
+            return list(query)
+        return query.execute()
+
+    async def get(self, source: Any, *args: Any, **kwargs: Any) -> Any:
+        query = source.select() if isclass(source) else source
+        if kwargs:
+            query = query.filter(**kwargs)
+        if args:
+            query = query.where(*args)
+        return query.get()
+
+    async def create(self, model: Any, **data: Any) -> Any:
+        return model.create(**data)
+
+    async def update(self, obj: Any, only: Iterable = None) -> int:
+        return obj.save(only=only)
+
+    async def delete(
+        self,
+        obj: Any,
+        recursive: bool = False,
+        delete_nullable: bool = False,
+    ) -> int:
+        return obj.delete_instance(recursive, delete_nullable)
+
+    async def count(self, query: Any, clear_limit: bool = False) -> int:
+        return query.count(clear_limit=clear_limit)
+
+    @asynccontextmanager
+    async def atomic(self):
+        with self.database.atomic():
+            yield
+
+
+class Client:
+    def __init__(self, host: str, port: int) -> None:
+        self.host = host
+        self.port = port
+        self.reader = self.writer = None
+
+    async def request(
+        self, method: str, path: str, body: Optional[dict] = None
+    ) -> int:
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(
+                self.host, self.port
+            )
+        payload = json.dumps(body).encode("utf-8") if body else b""
+        head = f"{method} {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+        if payload:
+            head += "Content-Type: application/json\r\n"
+        head += f"Content-Length: {len(payload)}\r\n\r\n"
+        self.writer.write(head.encode("latin1") + payload)
+        status_line = await self.reader.readline()
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin1").partition(":")
+            if name.lower() == "content-length":
+                length = int(value)
+        if length:
+            await self.reader.readexactly(length)
+        return int(status_line.split()[1])
+
+    def close(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+
+
+def scenarios(size: int) -> List[Tuple[str, str, Any, Any]]:
+    counter = itertools.count()
+    return [
+        ("list", "GET", lambda: "/api/items?limit=20", None),
+        (
+            "retrieve",
+            "GET",
+            lambda: f"/api/items/{next(counter) % size + 1}",
+            None,
+        ),
+        (
+            "create",
+            "POST",
+            lambda: "/api/items",
+            lambda: dict(name=f"new{next(counter)}", price=1),
+        ),
+        (
+            "partial_update",
+            "PATCH",
+            lambda: f"/api/items/{next(counter) % size + 1}",
+            lambda: dict(price=2),
+        ),
+    ]
+
+
+def percentile(values: List[float], percent: float) -> float:
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, int(round(percent * (len(values) - 1))))
+    return values[index]
+
+
+async def drive(
+    host: str,
+    port: int,
+    method: str,
+    path: Any,
+    body: Any,
+    concurrency: int,
+    duration: float,
+) -> dict:
+    latencies, errors = [], 0
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        nonlocal errors
+        client = Client(host, port)
+        try:
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                payload = body() if body else None
+                code = await client.request(method, path(), payload)
+                latencies.append(time.perf_counter() - started)
+                if code >= 400:
+                    errors += 1
+        finally:
+            client.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50": percentile(latencies, 0.50),
+        "p99": percentile(latencies, 0.99),
+    }
+
+
+def make_app(size: int) -> tornado.web.Application:
+    database = peewee.SqliteDatabase(":memory:")
+    database.bind([Item])
+    database.connect()
+    database.create_tables([Item])
+    rows = [dict(name=f"item{i}", price=i) for i in range(size)]
+    Item.insert_many(rows).execute()
+    path = os.path.relpath(os.path.join(BASE_DIR, "loadapp", "routers"))
+    app = tornado.web.Application(
+        handlers=get_routes(path=path),
+        default_handler_class=NotFoundHandler,
+    )
+    app.db = SQLiteManager(database)
+    return app
+
+
+async def run(
+    concurrency: int = 16,
+    duration: float = 5.0,
+    warmup: float = 1.0,
+    size: int = 1000,
+    keyword: str = None,
+) -> dict:
+    host = "127.0.0.1"
+    sockets = bind_sockets(0, host)
+    port = sockets[0].getsockname()[1]
+    server = HTTPServer(make_app(size))
+    server.add_sockets(sockets)
+    results = {}
+    try:
+        for name, method, path, body in scenarios(size):
+            if keyword and keyword not in name:
+                continue
+            if warmup:
+                await drive(
+                    host, port, method, path, body, concurrency, warmup
+                )
+            results[name] = result = await drive(
+                host, port, method, path, body, concurrency, duration
+            )
+            print(
+                f"{name:<16} {result['rps']:>10.1f} req/s  "
+                f"p50 {result['p50'] * 1e3:>7.2f} ms  "
+                f"p99 {result['p99'] * 1e3:>7.2f} ms  "
+                f"errors {result['errors']}"
+            )
+    finally:
+        server.stop()
+    return results
+
+
+def main(argv: Iterable[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", dest="keyword", help="only run matching routes")
+    parser.add_argument("-c", "--concurrency", type=int, default=16)
+    parser.add_argument("-d", "--duration", type=float, default=5.0)
+    parser.add_argument("--warmup", type=float, default=1.0)
+    parser.add_argument(
+        "--size", type=int, default=1000, help="rows seeded into the table"
+    )
+    parser.add_argument(
+        "--save", nargs="?", const=DEFAULT_BASELINE, metavar="PATH"
+    )
+    parser.add_argument(
+        "--compare", nargs="?", const=DEFAULT_BASELINE, metavar="PATH"
+    )
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    results = asyncio.run(
+        run(
+            args.concurrency,
+            args.duration,
+            args.warmup,
+            args.size,
+            args.keyword,
+        )
+    )
+    failed = sorted(name for name, x in results.items() if x["errors"])
+    if failed:
+        # Error responses take other code paths, the timings are not
+        # comparable.
+        print(f"\nRequests failed in: {', '.join(failed)}")
+        return 1
+    if args.save:
+        save_results(args.save, results)
+        print(f"\nBaseline saved to {args.save}")
+    if args.compare:
+        baseline = load_results(args.compare)
+        regressions = {}
+        for metric in ("p50", "p99"):
+            for name, change in compare(
+                baseline, results, args.threshold, metric
+            ).items():
+                regressions[f"{name} {metric}"] = change
+        for name, change in compare(
+            baseline, results, args.threshold, "rps", higher_is_better=True
+        ).items():
+            regressions[f"{name} rps"] = change
+        for name, change in sorted(regressions.items()):
+            print(f"REGRESSION {name}: {change:+.1%}")
+        if regressions:
+            return 1
+        print(f"\nNo regressions beyond {args.threshold:.0%}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
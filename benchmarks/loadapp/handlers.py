@@ -0,0 +1,52 @@
+from tornado_restful import status
+from tornado_restful.exceptions import NotFoundError
+from tornado_restful.handlers import APIHandler
+
+from benchmarks.loadapp.models import Item
+from benchmarks.loadapp.serializers import ItemSerializer
+
+
+class ItemHandler(APIHandler):
+    async def list(self):
+        limit, offset = self.paginate()
+        db = self.application.db
+        items = await db.execute(Item.select().limit(limit).offset(offset))
+        total = await db.count(Item.select())
+        serializer = ItemSerializer(items, many=True)
+        self.set_status(status.HTTP_200_OK)
+        return self.finish({"total": total, "results": serializer.data})
+
+    async def retrieve(self, pk):
+        item = await self.get_object(pk)
+        serializer = ItemSerializer(item)
+        self.set_status(status.HTTP_200_OK)
+        return self.finish(serializer.data)
+
+    async def create(self):
+        serializer = ItemSerializer(
+            data=self.request.data, context={"db": self.application.db}
+        )
+        serializer.is_valid(raise_exception=True)
+        await serializer.save()
+        self.set_status(status.HTTP_201_CREATED)
+        return self.finish(serializer.data)
+
+    async def partial_update(self, pk):
+        item = await self.get_object(pk)
+        serializer = ItemSerializer(
+            item,
+            self.request.data,
+            partial=True,
+            context={"db": self.application.db},
+        )
+        serializer.is_valid(raise_exception=True)
+        await serializer.save()
+        self.set_status(status.HTTP_200_OK)
+        return self.finish(serializer.data)
+
+    async def get_object(self, pk):
+        try:
+            item = await self.application.db.get(Item, id=pk)
+        except Item.DoesNotExist:
+            raise NotFoundError
+        return item
@@ -0,0 +1,7 @@
+from tornado_restful import models
+
+
+class Item(models.Model):
+    name = models.CharField(max_length=40, unique=True)
+    price = models.IntegerField(default=0)
+    is_active = models.BooleanField(default=True)
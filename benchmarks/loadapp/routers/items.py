@@ -0,0 +1,6 @@
+from tornado_restful.routers import NestedRouter
+
+from benchmarks.loadapp.handlers import ItemHandler
+
+router = NestedRouter()
+router.register(r"items", ItemHandler)
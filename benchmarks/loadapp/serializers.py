@@ -0,0 +1,19 @@
+from tornado_restful.serializers import Serializer, fields, validate
+
+from benchmarks.loadapp.models import Item
+
+
+class ItemSerializer(Serializer):
+    id = fields.Int(dump_only=True)
+    name = fields.Str(required=True, validate=validate.Length(max=40))
+    price = fields.Int()
+    is_active = fields.Bool()
+
+    async def create(self, validated_data):
+        return await self.context["db"].create(Item, **validated_data)
+
+    async def update(self, instance, validated_data):
+        for key, value in validated_data.items():
+            setattr(instance, key, value)
+        await self.context["db"].update(instance)
+        return instance
@@ -0,0 +1,171 @@
+"""Run the component microbenchmarks.
+
+    $ python -m benchmarks.run                  # run everything
+    $ python -m benchmarks.run -k serializers   # only matching cases
+    $ python -m benchmarks.run --save           # store a baseline
+    $ python -m benchmarks.run --compare        # flag regressions
+
+Every ``bench_*`` module in this package defines ``bench_*`` generator
+functions which yield ``(label, callable)`` pairs. Setup happens in the
+generator, only the callable is timed. Cases are named
+``module.function[label]``, ``-k`` skips the setup of the functions whose
+name does not match. A failing function is reported and the run goes on.
+"""
+import argparse
+import importlib
+import json
+import os
+import pkgutil
+import platform
+import sys
+import timeit
+from statistics import median
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Tuple,
+)
+
+os.environ.setdefault("TORNADO_SETTINGS_MODULE", "benchmarks.settings")
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BASE_DIR, "results", "baseline.json")
+DEFAULT_THRESHOLD = 0.1
+
+Case = Tuple[str, Callable[[], None]]
+
+
+def discover() -> Iterator[Tuple[str, Callable[[], Iterable[Case]]]]:
+    for module_info in sorted(
+        pkgutil.iter_modules([BASE_DIR]), key=lambda x: x.name
+    ):
+        if not module_info.name.startswith("bench_"):
+            continue
+        module = importlib.import_module("benchmarks." + module_info.name)
+        for attr in sorted(dir(module)):
+            factory = getattr(module, attr)
+            if attr.startswith("bench_") and callable(factory):
+                yield f"{module_info.name[6:]}.{attr[6:]}", factory
+
+
+def measure(func: Callable[[], None], repeat: int) -> dict:
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    timings = [x / number for x in timer.repeat(repeat=repeat, number=number)]
+    return {"min": min(timings), "median": median(timings), "number": number}
+
+
+def save_results(path: str, results: Dict[str, dict]) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(
+            {
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "results": results,
+            },
+            f,
+            indent=2,
+            sort_keys=True,
+        )
+
+
+def load_results(path: str) -> Dict[str, dict]:
+    with open(path) as f:
+        return json.load(f)["results"]
+
+
+def compare(
+    baseline: Dict[str, dict],
+    results: Dict[str, dict],
+    threshold: float = DEFAULT_THRESHOLD,
+    metric: str = "min",
+    higher_is_better: bool = False,
+) -> Dict[str, float]:
+    regressions = {}
+    for name, result in results.items():
+        if name not in baseline or not baseline[name][metric]:
+            continue
+        change = result[metric] / baseline[name][metric] - 1
+        if higher_is_better:
+            change = -change
+        if change > threshold:
+            regressions[name] = change
+    return regressions
+
+
+def format_duration(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def run(
+    keyword: str = None,
+    repeat: int = 5,
+    out: Callable[[str], None] = print,
+) -> Tuple[Dict[str, dict], List[str]]:
+    results, failures = {}, []
+    for name, factory in discover():
+        # Skip the setup of factories that cannot yield a matching case.
+        if keyword and keyword.partition("[")[0] not in name:
+            continue
+        try:
+            for label, func in factory():
+                case = f"{name}[{label}]" if label else name
+                if keyword and keyword not in case:
+                    continue
+                results[case] = result = measure(func, repeat)
+                out(
+                    f"{case:<48} {format_duration(result['min']):>10} "
+                    f"(median {format_duration(result['median'])})"
+                )
+        except Exception as e:
+            failures.append(name)
+            out(f"{name:<48} FAILED {type(e).__name__}: {e}")
+    return results, failures
+
+
+def main(argv: Iterable[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", dest="keyword", help="only run matching cases")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--save", nargs="?", const=DEFAULT_BASELINE, metavar="PATH"
+    )
+    parser.add_argument(
+        "--compare", nargs="?", const=DEFAULT_BASELINE, metavar="PATH"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="relative slowdown reported as a regression (default: 0.1)",
+    )
+    args = parser.parse_args(argv)
+
+    results, failures = run(args.keyword, args.repeat)
+    if args.save:
+        save_results(args.save, results)
+        print(f"\nBaseline saved to {args.save}")
+    if args.compare:
+        regressions = compare(
+            load_results(args.compare), results, args.threshold
+        )
+        for name, change in sorted(regressions.items()):
+            print(f"REGRESSION {name}: {change:+.1%}")
+        if regressions:
+            return 1
+        print(f"\nNo regressions beyond {args.threshold:.0%}.")
+    if failures:
+        print(f"\nFailed: {', '.join(failures)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
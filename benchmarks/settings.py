@@ -0,0 +1,8 @@
+debug = False
+secret_key = "benchmark-secret-key-0123456789ab"
+
+routers_path = ""
+api_prefix = "/api"
+trailing_slash = False
+
+page_size = 100
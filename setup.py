@@ -14,13 +14,18 @@ setuptools.setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/245967906/tornado-restful",
-    packages=setuptools.find_packages(),
+    packages=setuptools.find_packages(exclude=["benchmarks*", "tests*"]),
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: GNU General Public License v3 (GPLv3)",
         "Operating System :: OS Independent",
     ],
     python_requires='>=3.6',
+    entry_points={
+        "console_scripts": [
+            "tornado-restful=tornado_restful.__main__:main",
+        ],
+    },
     install_requires=[
         "aiomysql>=0.0.20",
         "inflection>=0.4.0",
@@ -32,4 +37,7 @@ setuptools.setup(
         "pyjwt>=1.7.1",
         "tornado>=6.0.4",
     ],
+    extras_require={
+        "msgpack": ["msgpack>=1.0.0"],
+    },
 )
@@ -0,0 +1,3 @@
+import os
+
+os.environ.setdefault("TORNADO_SETTINGS_MODULE", "tests.settings")
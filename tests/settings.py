@@ -0,0 +1 @@
+secret_key = "test-secret-key-0123456789abcdef"
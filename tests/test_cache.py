@@ -0,0 +1,129 @@
+import asyncio
+
+import pytest
+
+from tornado_restful.cache import TTLCache
+
+
+class Timer:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_expiry():
+    timer = Timer()
+    cache = TTLCache(ttl=10, timer=timer)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=20)
+    timer.now = 10
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    timer.now = 20
+    assert cache.get("b", "missing") == "missing"
+    assert len(cache) == 0
+
+
+def test_lru_eviction():
+    cache = TTLCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_get_or_load_coalesces():
+    cache = TTLCache()
+    calls = []
+
+    async def loader():
+        calls.append(None)
+        await asyncio.sleep(0.01)
+        return "value"
+
+    async def main():
+        results = await asyncio.gather(
+            *(cache.get_or_load("key", loader) for _ in range(5))
+        )
+        assert results == ["value"] * 5
+        assert await cache.get_or_load("key", loader) == "value"
+
+    asyncio.run(main())
+    assert len(calls) == 1
+    assert cache._pending == {}
+
+
+def test_get_or_load_cancelled_caller():
+    cache = TTLCache()
+
+    async def loader():
+        await asyncio.sleep(0.01)
+        return "value"
+
+    async def main():
+        first = asyncio.ensure_future(cache.get_or_load("key", loader))
+        second = asyncio.ensure_future(cache.get_or_load("key", loader))
+        await asyncio.sleep(0)
+        first.cancel()
+        assert await second == "value"
+        assert first.cancelled()
+
+    asyncio.run(main())
+    assert cache.get("key") == "value"
+
+
+def test_get_or_load_error_is_not_cached():
+    cache = TTLCache()
+    calls = []
+
+    async def loader():
+        calls.append(None)
+        if len(calls) == 1:
+            raise ValueError("failed")
+        return "value"
+
+    async def main():
+        with pytest.raises(ValueError):
+            await cache.get_or_load("key", loader)
+        assert await cache.get_or_load("key", loader) == "value"
+
+    asyncio.run(main())
+    assert len(calls) == 2
+
+
+def test_invalidate_during_load():
+    cache = TTLCache()
+    values = iter(("stale", "fresh"))
+
+    async def loader():
+        await asyncio.sleep(0.01)
+        return next(values)
+
+    async def main():
+        pending = asyncio.ensure_future(cache.get_or_load("key", loader))
+        await asyncio.sleep(0)
+        cache.invalidate("key")
+        # The waiting caller still gets its result, but it is not stored
+        # and the next miss loads again.
+        assert await pending == "stale"
+        assert cache.get("key") is None
+        assert await cache.get_or_load("key", loader) == "fresh"
+
+    asyncio.run(main())
+    assert cache.get("key") == "fresh"
+
+
+def test_invalidate_and_clear():
+    cache = TTLCache()
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.invalidate("a")
+    cache.invalidate("missing")
+    assert cache.get("a") is None
+    cache.clear()
+    assert len(cache) == 0
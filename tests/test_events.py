@@ -0,0 +1,104 @@
+import asyncio
+
+from tornado_restful.events import Event, EventBroker, format_event
+
+
+def drain(subscription):
+    events = list(subscription.events)
+    subscription.events.clear()
+    return events
+
+
+def test_publish_to_subscribers():
+    broker = EventBroker()
+    posts = broker.subscribe("posts")
+    comments = broker.subscribe("comments")
+    event = broker.publish("posts", "created", {"id": 1})
+    assert event == Event(1, "posts", "created", {"id": 1})
+    assert drain(posts) == [event]
+    assert drain(comments) == []
+
+
+def test_resume_after_last_event_id():
+    broker = EventBroker()
+    events = [broker.publish("posts", "created", {"id": i}) for i in range(3)]
+    broker.publish("comments", "created", {"id": 1})
+    subscription = broker.subscribe("posts", last_event_id=events[0].id)
+    assert drain(subscription) == events[1:]
+    event = broker.publish("posts", "deleted", {"id": 0})
+    assert drain(subscription) == [event]
+
+
+def test_resume_up_to_date():
+    broker = EventBroker()
+    event = broker.publish("posts", "created", {"id": 1})
+    broker.publish("comments", "created", {"id": 1})
+    subscription = broker.subscribe("posts", last_event_id=event.id)
+    assert drain(subscription) == []
+
+
+def test_resume_from_evicted_history():
+    broker = EventBroker(history_size=2)
+    events = [broker.publish("posts", "created", {"id": i}) for i in range(4)]
+    # The events after the second one are still in the history.
+    subscription = broker.subscribe("posts", last_event_id=events[1].id)
+    assert drain(subscription) == events[2:]
+    subscription = broker.subscribe("posts", last_event_id=events[0].id)
+    assert drain(subscription) == [Event(4, "posts", "reset", None)]
+
+
+def test_resume_from_unknown_id():
+    broker = EventBroker()
+    broker.publish("posts", "created", {"id": 1})
+    # An id from before a restart of the process.
+    subscription = broker.subscribe("posts", last_event_id=100)
+    assert drain(subscription) == [Event(1, "posts", "reset", None)]
+
+
+def test_resume_more_than_buffer():
+    broker = EventBroker(buffer_size=2)
+    for i in range(3):
+        broker.publish("posts", "created", {"id": i})
+    subscription = broker.subscribe("posts", last_event_id=0)
+    assert drain(subscription) == [Event(3, "posts", "reset", None)]
+
+
+def test_slow_subscriber_is_closed():
+    broker = EventBroker(buffer_size=2)
+    subscription = broker.subscribe("posts")
+    events = [broker.publish("posts", "created", {"id": i}) for i in range(3)]
+    assert subscription.closed
+    assert broker.topics["posts"].subscriptions == set()
+
+    async def main():
+        # The buffered events are delivered before the end of the stream.
+        assert await subscription.get() == events[0]
+        assert await subscription.get() == events[1]
+        assert await subscription.get() is None
+
+    asyncio.run(main())
+
+
+def test_get_waits_for_event():
+    broker = EventBroker()
+
+    async def main():
+        subscription = broker.subscribe("posts")
+        waiting = asyncio.ensure_future(subscription.get())
+        await asyncio.sleep(0)
+        assert not waiting.done()
+        event = broker.publish("posts", "created", {"id": 1})
+        assert await asyncio.wait_for(waiting, 1) == event
+        waiting = asyncio.ensure_future(subscription.get())
+        await asyncio.sleep(0)
+        subscription.close()
+        assert await asyncio.wait_for(waiting, 1) is None
+
+    asyncio.run(main())
+
+
+def test_format_event():
+    event = Event(3, "posts", "created", {"title": "é"})
+    assert format_event(event) == (
+        'id: 3\nevent: created\ndata: {"title": "é"}\n\n'
+    )
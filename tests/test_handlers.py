@@ -0,0 +1,153 @@
+import asyncio
+
+import tornado.web
+from tornado.httpclient import AsyncHTTPClient
+from tornado.httpserver import HTTPServer
+from tornado.httputil import HTTPHeaders, HTTPServerRequest
+from tornado.tcpclient import TCPClient
+from tornado.testing import bind_unused_port
+
+from tornado_restful.exceptions import UnauthorizedError
+from tornado_restful.handlers import APIHandler
+from tornado_restful.renderers import CSVRenderer, NDJSONRenderer
+from tornado_restful.middleware import Middleware
+
+
+class SlowMiddleware(Middleware):
+    async def process_request(self, handler):
+        await asyncio.sleep(0.2)
+
+
+class ItemHandler(APIHandler):
+    middleware = (SlowMiddleware, )
+
+    async def list(self):
+        self.application.calls.append(None)
+        self.write({"results": []})
+
+    def on_finish(self):
+        self.application.statuses.append(self.get_status())
+        super().on_finish()
+
+
+class Connection:
+    def set_close_callback(self, callback):
+        pass
+
+
+def make_handler(uri="/items", headers=None):
+    request = HTTPServerRequest(
+        method="GET",
+        uri=uri,
+        headers=HTTPHeaders(headers or {}),
+        connection=Connection(),
+    )
+    return ItemHandler(tornado.web.Application(), request)
+
+
+class AuthenticationMiddleware(Middleware):
+    def process_request(self, handler):
+        raise UnauthorizedError
+
+
+class PreflightHandler(APIHandler):
+    middleware = APIHandler.middleware + (AuthenticationMiddleware, )
+
+
+class CustomOptionsHandler(PreflightHandler):
+    async def options(self, pk):
+        self.application.calls.append(pk)
+        self.set_header("Allow", "GET, OPTIONS")
+        self.set_status(200)
+
+
+def serve(test):
+    async def main():
+        app = tornado.web.Application(
+            [
+                (r"/items", ItemHandler, dict(method_map={"get": "list"})),
+                (r"/preflight", PreflightHandler),
+                (r"/custom/(?P<pk>[0-9]+)", CustomOptionsHandler),
+            ]
+        )
+        app.calls, app.statuses = [], []
+        sock, port = bind_unused_port()
+        server = HTTPServer(app)
+        server.add_sockets([sock])
+        try:
+            await test(app, port)
+        finally:
+            server.stop()
+
+    asyncio.run(main())
+
+
+def test_action_runs():
+    async def test(app, port):
+        client = AsyncHTTPClient()
+        response = await client.fetch(f"http://127.0.0.1:{port}/items")
+        assert response.code == 200
+        assert len(app.calls) == 1
+
+    serve(test)
+
+
+def test_disconnect_during_prepare():
+    async def test(app, port):
+        stream = await TCPClient().connect("127.0.0.1", port)
+        await stream.write(b"GET /items HTTP/1.1\r\nHost: localhost\r\n\r\n")
+        await asyncio.sleep(0.05)
+        stream.close()
+        await asyncio.sleep(0.3)
+        assert app.calls == []
+        assert app.statuses == [499]
+
+    serve(test)
+
+
+def test_vary_accept():
+    async def test(app, port):
+        client = AsyncHTTPClient()
+        for accept in ("application/msgpack", None):
+            response = await client.fetch(
+                f"http://127.0.0.1:{port}/items",
+                headers={"Accept": accept} if accept else None,
+            )
+            assert response.headers.get_list("Vary") == ["Accept"]
+
+    serve(test)
+
+
+def test_renderer_from_accept():
+    handler = make_handler(headers={"Accept": "application/x-ndjson"})
+    assert isinstance(handler.get_renderer(), NDJSONRenderer)
+    assert handler._headers.get_list("Vary") == ["Accept"]
+
+
+def test_renderer_from_format():
+    handler = make_handler("/items?format=csv", {"Accept": "text/csv"})
+    assert isinstance(handler.get_renderer(), CSVRenderer)
+    assert "Vary" not in handler._headers
+
+
+def test_options():
+    async def test(app, port):
+        response = await AsyncHTTPClient().fetch(
+            f"http://127.0.0.1:{port}/preflight", method="OPTIONS"
+        )
+        # Answered before the authentication of the rest of the pipeline.
+        assert response.code == 204
+
+    serve(test)
+
+
+def test_options_overridden():
+    async def test(app, port):
+        response = await AsyncHTTPClient().fetch(
+            f"http://127.0.0.1:{port}/custom/1", method="OPTIONS"
+        )
+        assert response.code == 200
+        assert response.headers["Allow"] == "GET, OPTIONS"
+        assert app.calls == ["1"]
+
+    serve(test)
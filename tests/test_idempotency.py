@@ -0,0 +1,152 @@
+import asyncio
+
+import pytest
+from tornado.httputil import HTTPHeaders
+
+from tornado_restful.conf import settings
+from tornado_restful.exceptions import (
+    BadRequestError,
+    ConflictError,
+    UnprocessableEntityError,
+)
+from tornado_restful.idempotency import (
+    IdempotencyMiddleware,
+    MemoryIdempotencyStore,
+)
+
+
+class Request:
+    def __init__(self, key: str, body: bytes = b"{}") -> None:
+        self.method = "POST"
+        self.path = "/api/posts"
+        self.body = body
+        self.headers = HTTPHeaders({settings.idempotency_header: key})
+
+
+class Handler:
+    """The part of a `RequestHandler` that the middleware uses."""
+    def __init__(self, key: str = "key", body: bytes = b"{}") -> None:
+        self.request = Request(key, body)
+        self._idempotency = None
+        self._client_disconnected = False
+        self._status_code = 200
+        self._reason = "OK"
+        self._headers = {}
+        self._write_buffer = []
+        self.body = None
+
+    def get_status(self) -> int:
+        return self._status_code
+
+    def set_status(self, status_code: int, reason: str = None) -> None:
+        self._status_code = status_code
+        self._reason = reason
+
+    def set_header(self, name: str, value: str) -> None:
+        self._headers[name] = value
+
+    def finish(self, chunk: bytes = None) -> None:
+        self.body = chunk
+
+
+def respond(handler, status_code, body):
+    handler.set_status(status_code)
+    handler.set_header("Content-Type", "application/json")
+    handler._write_buffer.append(body)
+    handler._idempotency.record(handler)
+    handler._idempotency.finish(handler)
+
+
+async def process(middleware, handler):
+    await middleware.process_request(handler)
+
+
+def test_without_key():
+    handler = Handler()
+    del handler.request.headers[settings.idempotency_header]
+    assert IdempotencyMiddleware().process_request(handler) is None
+
+
+def test_invalid_key():
+    with pytest.raises(BadRequestError):
+        IdempotencyMiddleware().process_request(Handler("x" * 256))
+
+
+def test_duplicate_waits_for_response():
+    middleware = IdempotencyMiddleware(MemoryIdempotencyStore())
+
+    async def main():
+        first, second = Handler(), Handler()
+        await process(middleware, first)
+        assert first._idempotency is not None
+        waiting = asyncio.ensure_future(process(middleware, second))
+        await asyncio.sleep(0.01)
+        assert not waiting.done()
+        respond(first, 201, b'{"id": 1}')
+        await asyncio.wait_for(waiting, 1)
+        assert second._idempotency is None
+        assert second._status_code == 201
+        assert second._headers == {
+            "Content-Type": "application/json",
+            "Idempotent-Replayed": "true",
+        }
+        assert second.body == b'{"id": 1}'
+
+    asyncio.run(main())
+    assert middleware._inflight == {}
+
+
+def test_duplicate_runs_after_server_error():
+    middleware = IdempotencyMiddleware(MemoryIdempotencyStore())
+
+    async def main():
+        first, second = Handler(), Handler()
+        await process(middleware, first)
+        waiting = asyncio.ensure_future(process(middleware, second))
+        await asyncio.sleep(0.01)
+        respond(first, 500, b"")
+        await asyncio.wait_for(waiting, 1)
+        # The failed response is not replayed, the retry runs the action.
+        assert second._idempotency is not None
+        assert second.body is None
+
+    asyncio.run(main())
+
+
+def test_duplicate_times_out(monkeypatch):
+    monkeypatch.setattr(settings, "idempotency_wait_timeout", 0.05)
+    middleware = IdempotencyMiddleware(MemoryIdempotencyStore())
+
+    async def main():
+        await process(middleware, Handler())
+        with pytest.raises(ConflictError):
+            await process(middleware, Handler())
+
+    asyncio.run(main())
+
+
+def test_key_reused_with_different_body():
+    middleware = IdempotencyMiddleware(MemoryIdempotencyStore())
+
+    async def main():
+        first = Handler()
+        await process(middleware, first)
+        respond(first, 201, b'{"id": 1}')
+        await asyncio.sleep(0)
+        with pytest.raises(UnprocessableEntityError):
+            await process(middleware, Handler(body=b'{"a": 1}'))
+
+    asyncio.run(main())
+
+
+def test_keys_are_scoped_by_path():
+    middleware = IdempotencyMiddleware(MemoryIdempotencyStore())
+
+    async def main():
+        first, second = Handler(), Handler()
+        second.request.path = "/api/comments"
+        await process(middleware, first)
+        await asyncio.wait_for(process(middleware, second), 1)
+        assert second._idempotency is not None
+
+    asyncio.run(main())
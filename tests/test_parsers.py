@@ -0,0 +1,121 @@
+import pytest
+
+from tornado_restful.exceptions import BadRequestError
+from tornado_restful.parsers import JSONArrayParser, NDJSONParser
+
+
+def feed_bytes(parser, body):
+    # One byte at a time puts a chunk boundary everywhere.
+    records = []
+    for i in range(len(body)):
+        records.extend(parser.feed(body[i:i + 1]))
+    return records + parser.close()
+
+
+def test_ndjson_split_records():
+    body = '{"name": "é"}\n{"n": 12.5}\n\n[1, 2]'.encode()
+    assert feed_bytes(NDJSONParser(), body) == [
+        dict(name="é"),
+        dict(n=12.5),
+        [1, 2],
+    ]
+
+
+def test_ndjson_split_in_chunks():
+    parser = NDJSONParser()
+    assert parser.feed(b'{"a": 1}\n{"b"') == [{"a": 1}]
+    assert parser.feed(b': 2}\n') == [{"b": 2}]
+    assert parser.close() == []
+    assert parser.count == 2
+
+
+def test_ndjson_invalid_record():
+    parser = NDJSONParser()
+    with pytest.raises(BadRequestError):
+        parser.feed(b'{"a": 1}\n{"a": \n')
+
+
+def test_ndjson_record_too_large():
+    parser = NDJSONParser(max_record_size=4)
+    with pytest.raises(BadRequestError):
+        parser.feed(b'{"a": 1')
+
+
+def test_json_array_split_everywhere():
+    body = '[ {"name": "a,]\\"é"}, 12345, -1.5e3, "😀", [1, [2]], null ]'
+    assert feed_bytes(JSONArrayParser(), body.encode()) == [
+        dict(name='a,]"é'),
+        12345,
+        -1.5e3,
+        "😀",
+        [1, [2]],
+        None,
+    ]
+
+
+def test_json_array_split_in_number():
+    parser = JSONArrayParser()
+    assert parser.feed(b"[12") == []
+    assert parser.feed(b"34, 5") == [1234]
+    assert parser.feed(b"6]") == [56]
+    assert parser.close() == []
+
+
+def test_json_array_split_in_string():
+    parser = JSONArrayParser()
+    assert parser.feed(b'["ab') == []
+    assert parser.feed(b'c", "') == ["abc"]
+    assert parser.feed(b'd"]') == ["d"]
+    assert parser.close() == []
+
+
+def test_json_array_split_in_utf8_sequence():
+    body = '["€"]'.encode()
+    parser = JSONArrayParser()
+    assert parser.feed(body[:3]) == []
+    assert parser.feed(body[3:]) == ["€"]
+    assert parser.close() == []
+
+
+def test_json_array_split_in_exponent():
+    parser = JSONArrayParser()
+    assert parser.feed(b"[-1.") == []
+    assert parser.feed(b"5e") == []
+    assert parser.feed(b"+2]") == [-150.0]
+    assert parser.close() == []
+
+
+def test_json_array_empty():
+    parser = JSONArrayParser()
+    assert parser.feed(b" [ ] ") == []
+    assert parser.close() == []
+
+
+def test_json_array_trailing_data():
+    parser = JSONArrayParser()
+    with pytest.raises(BadRequestError):
+        parser.feed(b"[1] [2]")
+
+
+def test_json_array_trailing_data_in_next_chunk():
+    parser = JSONArrayParser()
+    assert parser.feed(b"[1]") == [1]
+    with pytest.raises(BadRequestError):
+        parser.feed(b",")
+
+
+@pytest.mark.parametrize(
+    "body",
+    (b"", b"[1, 2", b"[1,", b'["a', b"[1 2]", b"{}", b"[1,]", b'["\xe2\x82"]'),
+)
+def test_json_array_invalid(body):
+    parser = JSONArrayParser()
+    with pytest.raises(BadRequestError):
+        parser.feed(body)
+        parser.close()
+
+
+def test_json_array_record_too_large():
+    parser = JSONArrayParser(max_record_size=8)
+    with pytest.raises(BadRequestError):
+        parser.feed(b'["' + b"a" * 16)
@@ -0,0 +1,71 @@
+import asyncio
+from types import SimpleNamespace
+
+from tornado_restful.serializers import Serializer, fields
+
+
+class Handler:
+    def __init__(self, event_topic="users"):
+        self.event_topic = event_topic
+        self.events = []
+
+    def publish_event(self, type, data):
+        self.events.append((type, data))
+
+
+class UserSerializer(Serializer):
+    id = fields.Int(dump_only=True)
+    name = fields.Str(required=True)
+
+    def create(self, validated_data):
+        if isinstance(validated_data, list):
+            return [self.create(x) for x in validated_data]
+        return SimpleNamespace(id=1, **validated_data)
+
+    async def update(self, instance, validated_data):
+        instance.name = validated_data["name"]
+        return instance
+
+
+def save(serializer):
+    serializer.is_valid(raise_exception=True)
+    return asyncio.run(serializer.save())
+
+
+def test_save_publishes_created():
+    handler = Handler()
+    save(UserSerializer(data={"name": "foo"}, context={"handler": handler}))
+    assert handler.events == [("created", {"id": 1, "name": "foo"})]
+
+
+def test_save_publishes_updated():
+    handler = Handler()
+    user = SimpleNamespace(id=2, name="foo")
+    serializer = UserSerializer(
+        user, {"name": "bar"}, context={"handler": handler}
+    )
+    save(serializer)
+    assert handler.events == [("updated", {"id": 2, "name": "bar"})]
+    assert serializer.data == {"id": 2, "name": "bar"}
+
+
+def test_save_publishes_many():
+    handler = Handler()
+    save(
+        UserSerializer(
+            data=[dict(name="foo"), dict(name="bar")],
+            many=True,
+            context={"handler": handler},
+        )
+    )
+    assert handler.events == [
+        ("created", dict(id=1, name="foo")),
+        ("created", dict(id=1, name="bar")),
+    ]
+
+
+def test_save_without_topic():
+    handler = Handler(event_topic=None)
+    save(UserSerializer(data={"name": "foo"}, context={"handler": handler}))
+    save(UserSerializer(data={"name": "foo"}))
+    assert handler.events == []
@@ -0,0 +1,55 @@
+import asyncio
+
+from tornado.httpclient import AsyncHTTPClient
+from tornado.httpserver import HTTPServer
+from tornado.tcpclient import TCPClient
+from tornado.testing import bind_unused_port
+from tornado.web import RequestHandler
+
+from tornado_restful.server import make_app
+
+
+class ItemHandler(RequestHandler):
+    def post(self):
+        self.write(self.request.body)
+
+
+def serve(test):
+    async def main():
+        app = make_app([(r"/items", ItemHandler)])
+        sock, port = bind_unused_port()
+        server = HTTPServer(app)
+        server.add_sockets([sock])
+        try:
+            await test(app, port)
+        finally:
+            server.stop()
+
+    asyncio.run(main())
+
+
+def test_active_requests():
+    async def test(app, port):
+        response = await AsyncHTTPClient().fetch(
+            f"http://127.0.0.1:{port}/items", method="POST", body=b"{}"
+        )
+        assert response.body == b"{}"
+        assert app.active_requests == 0
+
+    serve(test)
+
+
+def test_active_requests_body_not_received():
+    async def test(app, port):
+        stream = await TCPClient().connect("127.0.0.1", port)
+        await stream.write(
+            b"POST /items HTTP/1.1\r\nHost: localhost\r\n"
+            b"Content-Length: 100\r\n\r\n{}"
+        )
+        await asyncio.sleep(0.05)
+        assert app.active_requests == 1
+        stream.close()
+        await asyncio.sleep(0.05)
+        assert app.active_requests == 0
+
+    serve(test)
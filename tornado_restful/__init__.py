@@ -1 +1,10 @@
 __version__ = "1.0.1"
+
+
+def setup(settings_module: str = None, **options) -> None:
+    """Load the settings and initialize the database explicitly, instead of
+    on first use."""
+    from tornado_restful.conf import settings
+    from tornado_restful.models import setup as setup_models
+    settings.configure(settings_module, **options)
+    setup_models()
@@ -0,0 +1,38 @@
+import argparse
+import sys
+from typing import Iterable
+
+from tornado.log import enable_pretty_logging
+
+
+def main(argv: Iterable[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog="tornado-restful")
+    subparsers = parser.add_subparsers(dest="command")
+    serve = subparsers.add_parser("serve", help="serve the application")
+    serve.add_argument("--address", help="address to bind to")
+    serve.add_argument("--port", type=int, help="port to listen on")
+    serve.add_argument(
+        "--workers",
+        type=int,
+        help="number of worker processes, defaults to the number of CPUs",
+    )
+    serve.add_argument(
+        "--reuse-port",
+        action="store_true",
+        default=None,
+        help="bind a SO_REUSEPORT socket in every worker instead of sharing "
+        "one pre-bound socket",
+    )
+    args = parser.parse_args(argv)
+
+    if args.command != "serve":
+        parser.print_help()
+        return 2
+    enable_pretty_logging()
+    from tornado_restful.server import serve as run_server
+    run_server(args.port, args.address, args.workers, args.reuse_port)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+import json
+import queue
+import random
+import sys
+import threading
+import time
+from typing import (
+    Any,
+    IO,
+    List,
+    Optional,
+)
+
+import tornado.web
+
+from tornado_restful.conf import settings
+
+_stop = object()
+
+
+class AccessLogger:
+    """Writes JSON access log records from a background thread.
+
+    Records are queued without blocking the event loop and written in
+    batches of up to `batch_size` lines; records that do not fit in the
+    queue of `maxsize` are dropped and counted.
+    """
+    def __init__(
+        self,
+        stream: IO[str] = None,
+        maxsize: int = 10000,
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+    ) -> None:
+        self.stream = stream or sys.stdout
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self.queue = queue.Queue(maxsize)
+        self.thread = threading.Thread(
+            target=self._run, name="access-log", daemon=True
+        )
+        self.thread.start()
+
+    def log(self, record: dict) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout: float = None) -> None:
+        self.queue.put(_stop)
+        self.thread.join(timeout)
+
+    def _run(self) -> None:
+        while True:
+            try:
+                batch = [self.queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            while batch[-1] is not _stop and len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = batch[-1] is _stop
+            if stop:
+                batch.pop()
+            self._write(batch)
+            if stop:
+                return
+
+    def _write(self, batch: List[dict]) -> None:
+        if not batch:
+            return
+        try:
+            self.stream.write(
+                "".join(
+                    json.dumps(x, ensure_ascii=False, default=str) + "\n"
+                    for x in batch
+                )
+            )
+            self.stream.flush()
+        except Exception:
+            # Logging must never take the process down.
+            pass
+
+
+def should_log(status: int, duration: float) -> bool:
+    if status >= 400:
+        return True
+    if duration >= settings.access_log_slow_threshold:
+        return True
+    return random.random() < settings.access_log_sample_rate
+
+
+def get_user_id(handler: tornado.web.RequestHandler) -> Any:
+    # Only a user that the request already loaded, logging never queries.
+    user = handler.__dict__.get("_current_user")
+    if user is None:
+        return None
+    get_id = getattr(user, "get_id", None)
+    return get_id() if get_id is not None else str(user)
+
+
+_logger = None
+
+
+def get_access_logger() -> AccessLogger:
+    global _logger
+    if _logger is None:
+        stream = None
+        if settings.access_log_path:
+            stream = open(settings.access_log_path, "a", encoding="utf-8")
+        _logger = AccessLogger(
+            stream,
+            maxsize=settings.access_log_queue_size,
+            batch_size=settings.access_log_batch_size,
+            flush_interval=settings.access_log_flush_interval,
+        )
+    return _logger
+
+
+def close_access_logger(timeout: float = None) -> None:
+    global _logger
+    if _logger is not None:
+        _logger.close(timeout)
+        _logger = None
+
+
+def log_request(handler: tornado.web.RequestHandler) -> None:
+    """A `log_function` application setting that samples the requests and
+    hands them to the access logger."""
+    status = handler.get_status()
+    request = handler.request
+    duration = request.request_time()
+    if not should_log(status, duration):
+        return
+    action_time: Optional[float] = getattr(handler, "_action_time", None)
+    if action_time is not None:
+        action_time = round(action_time * 1000, 3)
+    get_access_logger().log(
+        dict(
+            time=time.time(),
+            method=request.method,
+            path=request.path,
+            route=getattr(handler, "route", None),
+            status=status,
+            duration_ms=round(duration * 1000, 3),
+            action_ms=action_time,
+            user=get_user_id(handler),
+            remote_ip=request.remote_ip,
+        )
+    )
@@ -0,0 +1,47 @@
+from typing import Any, Optional
+
+from tornado_restful.cache import TTLCache
+from tornado_restful.conf import settings
+from tornado_restful.shortcuts import parse_json_web_token
+
+_user_cache = None
+
+
+def get_user_cache() -> TTLCache:
+    global _user_cache
+    if _user_cache is None:
+        _user_cache = TTLCache(
+            maxsize=settings.user_cache_size, ttl=settings.user_cache_ttl
+        )
+    return _user_cache
+
+
+async def load_user(model: Any, pk: Any, db: Any) -> Optional[Any]:
+    """Load a user by primary key through the process-wide user cache.
+
+    Cached instances are shared between requests and must not be mutated;
+    call `invalidate_user` after a user is updated or deactivated.
+    """
+    async def loader():
+        try:
+            return await db.get(model, model._meta.primary_key == pk)
+        except model.DoesNotExist:
+            return None
+
+    if not settings.user_cache_ttl:
+        return await loader()
+    return await get_user_cache().get_or_load((model, str(pk)), loader)
+
+
+async def get_user_from_token(model: Any, token: Optional[str],
+                              db: Any) -> Optional[Any]:
+    if not token:
+        return None
+    payload = parse_json_web_token(token)
+    if not payload or payload.get(settings.jwt_user_claim) is None:
+        return None
+    return await load_user(model, payload[settings.jwt_user_claim], db)
+
+
+def invalidate_user(model: Any, pk: Any) -> None:
+    get_user_cache().invalidate((model, str(pk)))
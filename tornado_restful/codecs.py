@@ -0,0 +1,78 @@
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+
+def encode_default(obj: Any) -> Any:
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, (Decimal, UUID)):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not serializable")
+
+
+class Codec:
+    media_type = ""
+
+    @property
+    def content_type(self) -> str:
+        return self.media_type
+
+    def encode(self, data: Any) -> bytes:
+        raise NotImplementedError("`encode` must be overridden.")
+
+    def decode(self, data: bytes) -> Any:
+        raise NotImplementedError("`decode` must be overridden.")
+
+
+class JSONCodec(Codec):
+    media_type = "application/json"
+    content_type = "application/json; charset=UTF-8"
+
+    def encode(self, data: Any) -> bytes:
+        chunk = json.dumps(
+            data, ensure_ascii=False, indent=2, default=encode_default
+        )
+        return (chunk.replace("</", "<\\/") + "\n").encode("utf-8")
+
+    def decode(self, data: bytes) -> Any:
+        return json.loads(data.decode("utf-8"))
+
+
+class MsgPackCodec(Codec):
+    media_type = "application/msgpack"
+
+    def encode(self, data: Any) -> bytes:
+        return msgpack.packb(data, default=encode_default, use_bin_type=True)
+
+    def decode(self, data: bytes) -> Any:
+        return msgpack.unpackb(data, raw=False)
+
+
+_codecs: Dict[str, Codec] = {}
+
+
+def register_codec(codec: Codec, *aliases: str) -> None:
+    for media_type in (codec.media_type, ) + aliases:
+        _codecs[media_type] = codec
+
+
+def get_codec(media_type: str) -> Optional[Codec]:
+    return _codecs.get(media_type)
+
+
+def get_codecs() -> Dict[str, Codec]:
+    return dict(_codecs)
+
+
+json_codec = JSONCodec()
+register_codec(json_codec)
+if msgpack is not None:
+    register_codec(MsgPackCodec(), "application/x-msgpack")
@@ -7,8 +7,10 @@ ENVIRONMENT_VARIABLE = "TORNADO_SETTINGS_MODULE"
 
 
 class Settings:
-    def __init__(self) -> None:
-        settings_module = os.environ.get(ENVIRONMENT_VARIABLE)
+    def __init__(self, settings_module: str = None) -> None:
+        settings_module = settings_module or os.environ.get(
+            ENVIRONMENT_VARIABLE
+        )
         if not settings_module:
             raise AssertionError(
                 "Requested settings, but settings are not configured. "
@@ -25,4 +27,33 @@ class Settings:
                 setattr(self, setting, getattr(mod, setting))
 
 
-settings = Settings()
+class LazySettings:
+    """Loads the settings module on first access rather than on import.
+
+    Annotated without `typing`, which would take most of the import time.
+    """
+    _wrapped = None
+
+    def __getattr__(self, name: str) -> object:
+        if self._wrapped is None:
+            self.configure()
+        value = getattr(self._wrapped, name)
+        # Later lookups of the same setting skip `__getattr__`.
+        self.__dict__[name] = value
+        return value
+
+    def configure(
+        self, settings_module: str = None, **options: object
+    ) -> None:
+        wrapped = Settings(settings_module)
+        for name, value in options.items():
+            setattr(wrapped, name, value)
+        self.__dict__.clear()
+        self._wrapped = wrapped
+
+    @property
+    def configured(self) -> bool:
+        return self._wrapped is not None
+
+
+settings = LazySettings()
@@ -5,6 +5,11 @@ routers_path = ""
 api_prefix = "/"
 trailing_slash = False
 
+cors_allow_origin = "*"
+cors_allow_headers = "*"
+cors_allow_methods = "GET, POST, PUT, PATCH, DELETE, HEAD, OPTIONS"
+cors_max_age = 0
+
 locales_path = ""
 default_locale = "en"
 
@@ -13,13 +18,64 @@ mysql_port = 3306
 mysql_username = ""
 mysql_password = ""
 mysql_dbname = ""
+mysql_max_connections = 10
 
 jwt_algorithms = "HS256"
 jwt_auth_header_prefix = "Bearer"
 jwt_expiration_delta = 7 * 24 * 3600
 jwt_leeway = 0
+jwt_user_claim = "sub"
+
+user_cache_size = 10000
+user_cache_ttl = 60
 
 page_size = 100
+pagination_mode = "exact"
+request_timeout = 0
+bulk_max_size = 1000
+bulk_batch_size = 100
+export_chunk_size = 1000
+stream_batch_size = 500
+stream_max_body_size = 0
+
+events_history_size = 1000
+events_buffer_size = 100
+events_heartbeat_interval = 15
+
+idempotency_header = "Idempotency-Key"
+idempotency_ttl = 24 * 3600
+idempotency_lock_ttl = 60
+idempotency_wait_timeout = 10
+idempotency_cache_size = 10000
+
+serve_address = ""
+serve_port = 8888
+serve_workers = 0
+serve_reuse_port = False
+serve_xheaders = False
+serve_drain_timeout = 10
+
+access_log_enabled = False
+access_log_path = ""
+access_log_sample_rate = 0.01
+access_log_slow_threshold = 1.0
+access_log_queue_size = 10000
+access_log_batch_size = 100
+access_log_flush_interval = 1.0
+
+task_max_concurrency = 100
+task_max_pending = 10000
+task_thread_pool_size = 4
+task_max_pending_sync = 1000
+task_drain_timeout = 10
+
+profile_enabled = False
+profile_token = ""
+profile_header = "X-Profile"
+profile_query_argument = "profile"
+profile_sample_rate = 0.0
+profile_format = "pstats"
+profile_output_dir = ""
 
 email_host = "localhost"
 email_port = 25
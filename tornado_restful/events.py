@@ -0,0 +1,148 @@
+import asyncio
+import json
+from collections import deque, namedtuple
+from typing import (
+    Any,
+    Dict,
+    Optional,
+    Set,
+)
+
+from tornado_restful.codecs import encode_default
+from tornado_restful.conf import settings
+
+Event = namedtuple("Event", ("id", "topic", "type", "data"))
+
+
+def format_event(event: Event) -> str:
+    data = json.dumps(event.data, ensure_ascii=False, default=encode_default)
+    return f"id: {event.id}\nevent: {event.type}\ndata: {data}\n\n"
+
+
+class Topic:
+    def __init__(self, history_size: int) -> None:
+        self.history = deque(maxlen=history_size)
+        self.subscriptions: Set["Subscription"] = set()
+        # Id of the newest event that fell out of the history.
+        self.evicted_id = 0
+
+
+class Subscription:
+    """The events of a topic buffered for one connection.
+
+    A consumer that falls `maxsize` events behind is closed after the
+    buffered events, it resumes from the history with `Last-Event-ID`.
+    """
+    def __init__(self, broker: "EventBroker", topic: str, maxsize: int):
+        self.broker = broker
+        self.topic = topic
+        self.maxsize = maxsize
+        self.events = deque()
+        self.closed = False
+        self._waiter = None
+
+    def put(self, event: Event) -> None:
+        if self.closed:
+            return
+        if len(self.events) >= self.maxsize:
+            self.close()
+            return
+        self.events.append(event)
+        self._wake()
+
+    async def get(self) -> Optional[Event]:
+        while not self.events:
+            if self.closed:
+                return None
+            self._waiter = asyncio.get_event_loop().create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+        return self.events.popleft()
+
+    def close(self) -> None:
+        if not self.closed:
+            self.closed = True
+            self.broker.unsubscribe(self)
+            self._wake()
+
+    def _wake(self) -> None:
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+
+class EventBroker:
+    """In-process publish/subscribe of change events.
+
+    Every topic keeps its last `history_size` events so that subscribers can
+    resume after the id of the last event they received. When the missed
+    events are no longer available a single `reset` event is sent instead,
+    telling the client to reload the collection.
+    """
+    def __init__(
+        self, history_size: int = 1000, buffer_size: int = 100
+    ) -> None:
+        self.history_size = history_size
+        self.buffer_size = buffer_size
+        self.last_id = 0
+        self.topics: Dict[str, Topic] = {}
+
+    def get_topic(self, name: str) -> Topic:
+        topic = self.topics.get(name)
+        if topic is None:
+            topic = self.topics[name] = Topic(self.history_size)
+        return topic
+
+    def publish(self, topic: str, type: str, data: Any) -> Event:
+        self.last_id += 1
+        event = Event(self.last_id, topic, type, data)
+        instance = self.get_topic(topic)
+        history = instance.history
+        if history.maxlen and len(history) == history.maxlen:
+            instance.evicted_id = history[0].id
+        history.append(event)
+        for subscription in tuple(instance.subscriptions):
+            subscription.put(event)
+        return event
+
+    def subscribe(
+        self, topic: str, last_event_id: Optional[int] = None
+    ) -> Subscription:
+        instance = self.get_topic(topic)
+        subscription = Subscription(self, topic, self.buffer_size)
+        if last_event_id is not None:
+            missed = [x for x in instance.history if x.id > last_event_id]
+            if (
+                last_event_id < instance.evicted_id
+                or last_event_id > self.last_id
+                or len(missed) > self.buffer_size
+            ):
+                missed = [Event(self.last_id, topic, "reset", None)]
+            subscription.events.extend(missed)
+        instance.subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        topic = self.topics.get(subscription.topic)
+        if topic is not None:
+            topic.subscriptions.discard(subscription)
+
+
+_broker = None
+
+
+def get_broker() -> EventBroker:
+    global _broker
+    if _broker is None:
+        _broker = EventBroker(
+            history_size=settings.events_history_size,
+            buffer_size=settings.events_buffer_size,
+        )
+    return _broker
+
+
+async def publish(topic: str, type: str, data: Any) -> Event:
+    # A coroutine so that `APIHandler.defer` runs it on the event loop, the
+    # broker is not thread-safe.
+    return get_broker().publish(topic, type, data)
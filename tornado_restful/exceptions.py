@@ -34,6 +34,26 @@ class MethodNotAllowedError(APIException):
     message = "Method Not Allowed"
 
 
+class NotAcceptableError(APIException):
+    status_code = status.HTTP_406_NOT_ACCEPTABLE
+    message = "Not Acceptable"
+
+
 class ConflictError(APIException):
     status_code = status.HTTP_409_CONFLICT
     message = "Conflict"
+
+
+class UnsupportedMediaTypeError(APIException):
+    status_code = status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+    message = "Unsupported Media Type"
+
+
+class UnprocessableEntityError(APIException):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    message = "Unprocessable Entity"
+
+
+class GatewayTimeoutError(APIException):
+    status_code = status.HTTP_504_GATEWAY_TIMEOUT
+    message = "Gateway Timeout"
@@ -0,0 +1,226 @@
+import math
+import uuid
+from decimal import Decimal
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Tuple,
+    Union,
+)
+
+import peewee
+
+from tornado_restful.exceptions import BadRequestError
+
+ORDERING_PARAM = "ordering"
+RESERVED_PARAMS = (
+    "limit",
+    "offset",
+    "fields",
+    "exclude",
+    "format",
+    ORDERING_PARAM,
+)
+
+LOOKUPS = {
+    "exact": lambda field, value: field == value,
+    "ne": lambda field, value: field != value,
+    "lt": lambda field, value: field < value,
+    "lte": lambda field, value: field <= value,
+    "gt": lambda field, value: field > value,
+    "gte": lambda field, value: field >= value,
+    "in": lambda field, value: field.in_(value),
+    "contains": lambda field, value: field.contains(value),
+    "startswith": lambda field, value: field.startswith(value),
+    "isnull": lambda field, value: field.is_null(value),
+}
+
+TRUE_VALUES = ("1", "true", "yes", "on")
+FALSE_VALUES = ("0", "false", "no", "off")
+
+
+def to_int(field: peewee.Field, value: str) -> int:
+    return int(value)
+
+
+def to_decimal(field: peewee.Field, value: str) -> Decimal:
+    value = Decimal(value)
+    if not value.is_finite():
+        raise ValueError(value)
+    return value
+
+
+def to_float(field: peewee.Field, value: str) -> float:
+    value = float(value)
+    if not math.isfinite(value):
+        raise ValueError(value)
+    return value
+
+
+def to_uuid(field: peewee.Field, value: str) -> uuid.UUID:
+    return uuid.UUID(value)
+
+
+def to_temporal(field: peewee.Field, value: str) -> Any:
+    # `adapt` returns the string itself when none of the formats match.
+    value = field.adapt(value)
+    if isinstance(value, str):
+        raise ValueError(value)
+    return value
+
+
+def to_timestamp(field: peewee.Field, value: str) -> Any:
+    try:
+        return int(value)
+    except ValueError:
+        return to_temporal(peewee.DateTimeField(), value)
+
+
+# `field.adapt` passes invalid strings through for most field types, which
+# the database would then coerce (e.g. `'abc'` to `0`).
+CONVERTERS = (
+    (peewee.TimestampField, to_timestamp),
+    (peewee.IntegerField, to_int),
+    (peewee.FloatField, to_float),
+    (peewee.DecimalField, to_decimal),
+    (peewee.DateTimeField, to_temporal),
+    (peewee.DateField, to_temporal),
+    (peewee.TimeField, to_temporal),
+    (peewee.UUIDField, to_uuid),
+)
+
+
+def is_indexed(model: Any, field: peewee.Field) -> bool:
+    if field.primary_key or field.index or field.unique:
+        return True
+    for index in model._meta.indexes:
+        if isinstance(index, peewee.ModelIndex):
+            expressions = index._expressions
+            if expressions and expressions[0] is field:
+                return True
+        elif index[0] and index[0][0] == field.name:
+            return True
+    return False
+
+
+class FilterSpec:
+    def __init__(
+        self,
+        model: Any,
+        filter_fields: Union[Iterable[str], Mapping[str, Iterable[str]]] = (),
+        ordering_fields: Iterable[str] = (),
+        default_ordering: Iterable[str] = (),
+    ) -> None:
+        self.model = model
+        if not isinstance(filter_fields, Mapping):
+            filter_fields = {name: ("exact", ) for name in filter_fields}
+        self.filters: Dict[str, Tuple[peewee.Field, str]] = {}
+        for name, lookups in filter_fields.items():
+            field = self._get_field(name)
+            for lookup in lookups:
+                if lookup not in LOOKUPS:
+                    raise AssertionError(f"Invalid lookup `{lookup}`.")
+                param = name if lookup == "exact" else f"{name}__{lookup}"
+                if param in RESERVED_PARAMS:
+                    raise AssertionError(
+                        f"Filter `{param}` clashes with a reserved query "
+                        "argument."
+                    )
+                self.filters[param] = (field, lookup)
+        self.orderings = {}
+        for name in ordering_fields:
+            field = self._get_field(name)
+            if not is_indexed(model, field):
+                raise AssertionError(
+                    f"Ordering field `{name}` of `{model.__name__}` is not "
+                    "indexed."
+                )
+            self.orderings[name] = field.asc()
+            self.orderings["-" + name] = field.desc()
+        self.default_ordering = [self.orderings[x] for x in default_ordering]
+
+    def apply(self, query: Any, arguments: Dict[str, List[bytes]]) -> Any:
+        conditions = []
+        for param, values in arguments.items():
+            if param not in self.filters or not values:
+                continue
+            field, lookup = self.filters[param]
+            value = values[-1].decode("utf-8", "replace")
+            conditions.append(
+                self.compile(param, field, lookup, value.strip())
+            )
+        if conditions:
+            query = query.where(*conditions)
+        if ORDERING_PARAM in arguments:
+            value = arguments[ORDERING_PARAM][-1].decode("utf-8", "replace")
+            ordering = []
+            for name in (x.strip() for x in value.split(",") if x.strip()):
+                if name not in self.orderings:
+                    raise BadRequestError(
+                        detail={ORDERING_PARAM: [f"Invalid field `{name}`."]}
+                    )
+                ordering.append(self.orderings[name])
+            query = query.order_by(*ordering)
+        elif self.default_ordering:
+            query = query.order_by(*self.default_ordering)
+        return query
+
+    def compile(
+        self, param: str, field: peewee.Field, lookup: str, value: str
+    ) -> peewee.Expression:
+        if lookup == "isnull":
+            return LOOKUPS[lookup](field, self._to_bool(param, value))
+        if isinstance(field, peewee.BooleanField) and lookup == "exact" \
+                and hasattr(field, "is_true"):
+            if self._to_bool(param, value):
+                return field.is_true()
+            return field.is_false()
+        if lookup == "in":
+            value = [
+                self._to_python(param, field, x) for x in value.split(",")
+            ]
+        elif lookup not in ("contains", "startswith"):
+            value = self._to_python(param, field, value)
+        return LOOKUPS[lookup](field, value)
+
+    def _get_field(self, name: str) -> peewee.Field:
+        if name not in self.model._meta.fields:
+            raise AssertionError(
+                f"`{self.model.__name__}` has no field named `{name}`."
+            )
+        return self.model._meta.fields[name]
+
+    def _to_bool(self, param: str, value: str) -> bool:
+        if value.lower() in TRUE_VALUES:
+            return True
+        if value.lower() in FALSE_VALUES:
+            return False
+        raise BadRequestError(detail={param: ["Not a valid boolean."]})
+
+    def _to_python(self, param: str, field: peewee.Field, value: str) -> Any:
+        from tornado_restful.models.fields import EnumField
+        if isinstance(field, peewee.BooleanField):
+            return self._to_bool(param, value)
+        if isinstance(field, EnumField):
+            try:
+                return field._choices(int(value)).value
+            except ValueError:
+                pass
+            try:
+                return field._choices[value].value
+            except KeyError:
+                raise BadRequestError(detail={param: ["Not a valid choice."]})
+        if isinstance(field, peewee.ForeignKeyField):
+            return self._to_python(param, field.rel_field, value)
+        for field_class, convert in CONVERTERS:
+            if isinstance(field, field_class):
+                break
+        else:
+            return field.adapt(value)
+        try:
+            return convert(field, value)
+        except (TypeError, ValueError, ArithmeticError):
+            raise BadRequestError(detail={param: ["Not a valid value."]})
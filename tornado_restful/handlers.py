@@ -1,12 +1,23 @@
 from __future__ import annotations
 
+import asyncio
+import functools
+import hmac
 import json
+import random
+import tempfile
+import time
 import traceback
 from asyncio import Future
+from inspect import isawaitable
 from types import TracebackType
 from typing import (
+    TYPE_CHECKING,
     Any,
+    AsyncIterator,
     Awaitable,
+    Callable,
+    List,
     Optional,
     Tuple,
     Type,
@@ -14,44 +25,148 @@ from typing import (
 )
 
 import tornado.web
+from tornado.iostream import StreamClosedError
+from tornado.log import app_log
 
-from tornado_restful import status
+from tornado_restful import profiling, status
+from tornado_restful.codecs import Codec, get_codec, json_codec
 from tornado_restful.conf import settings
-from tornado_restful.exceptions import APIException, BadRequestError
+from tornado_restful.events import format_event, get_broker, publish
+from tornado_restful.exceptions import (
+    APIException,
+    BadRequestError,
+    GatewayTimeoutError,
+    NotAcceptableError,
+    UnsupportedMediaTypeError,
+)
 from tornado_restful.i18n import I18n
+from tornado_restful.middleware import (
+    Pipeline,
+    PreflightMiddleware,
+    RequestBodyMiddleware,
+    RequestTokenMiddleware,
+)
+from tornado_restful.parsers import parsers
+from tornado_restful.renderers import (
+    CSVRenderer,
+    JSONRenderer,
+    NDJSONRenderer,
+    Renderer,
+)
+from tornado_restful.tasks import get_scheduler
+
+if TYPE_CHECKING:
+    from tornado_restful.filters import FilterSpec
 
 
 class APIHandler(tornado.web.RequestHandler):
+    user_model = None
+    filter_fields = ()
+    ordering_fields = ()
+    default_ordering = ()
+    sparse_fields = None
+    renderer_classes = (JSONRenderer, NDJSONRenderer, CSVRenderer)
+    export_chunk_size = None
+    pagination_mode = None
+    event_topic = None
+    route = None
+    middleware = (
+        PreflightMiddleware,
+        RequestBodyMiddleware,
+        RequestTokenMiddleware,
+    )
+    profile_sample_rate = None
+    timeout = None
+    action_timeouts = {}
+    _action_task = None
+    _action_time = None
+    _client_disconnected = False
+    _deferred = None
+    _idempotency = None
+    _profiler = None
+    _response_codec = None
+
     def initialize(self, **kwargs: Any) -> None:
+        self._pipeline = kwargs.get("middleware") or self.get_pipeline()
+        if "profile_sample_rate" in kwargs:
+            self.profile_sample_rate = kwargs["profile_sample_rate"]
+        if "timeout" in kwargs:
+            self.timeout = kwargs["timeout"]
+        if "route" in kwargs:
+            self.route = kwargs["route"]
         if "method_map" in kwargs:
             method_map = kwargs["method_map"]
             for method, action in method_map.items():
                 handler = getattr(self, action)
-                setattr(self, method, handler)
+                setattr(
+                    self,
+                    method,
+                    functools.partial(
+                        self._run_action, handler, self.get_timeout(action)
+                    ),
+                )
+            for method, action in kwargs.get("bulk_method_map", {}).items():
+                bulk_handler = getattr(self, action)
+                handler = getattr(self, method_map.get(method, ""), None)
+                setattr(
+                    self,
+                    method,
+                    functools.partial(
+                        self._run_action,
+                        functools.partial(
+                            self._dispatch_bulk, bulk_handler, handler
+                        ),
+                        self.get_timeout(action),
+                    ),
+                )
 
     def prepare(self) -> Optional[Awaitable[None]]:
-        self.request.data = self._parse_request_body()
-        self.request.token = self._parse_request_token()
+        if settings.profile_enabled and self._should_profile():
+            self._profiler = profiling.start_profiler(settings.profile_format)
+        self.request.data = None
+        self.request.token = None
+        return self._pipeline(self)
 
     def options(self, *args: str, **kwargs: str) -> Future[None]:
         self.set_status(status.HTTP_204_NO_CONTENT)
         return self.finish()
 
     def set_default_headers(self) -> None:
-        self.set_header("Access-Control-Allow-Origin", "*")
-        self.set_header("Access-Control-Allow-Headers", "*")
-        self.set_header(
-            "Access-Control-Allow-Methods",
-            "GET, POST, PUT, PATCH, DELETE, HEAD, OPTIONS"
-        )
+        for name, value in self.get_default_headers():
+            self._headers[name] = value
+
+    @classmethod
+    def get_default_headers(cls) -> Tuple[Tuple[str, str], ...]:
+        headers = cls.__dict__.get("_default_headers")
+        if headers is None:
+            headers = cls._default_headers = (
+                ("Access-Control-Allow-Origin", settings.cors_allow_origin),
+                ("Access-Control-Allow-Headers", settings.cors_allow_headers),
+                ("Access-Control-Allow-Methods", settings.cors_allow_methods),
+            )
+        return headers
+
+    @classmethod
+    def get_pipeline(cls) -> Pipeline:
+        pipeline = cls.__dict__.get("_compiled_pipeline")
+        if pipeline is None:
+            pipeline = cls._compiled_pipeline = Pipeline(cls.middleware)
+        return pipeline
 
     def write(self, chunk: Union[str, bytes, dict]) -> None:
+        if self._client_disconnected:
+            return
         if isinstance(chunk, dict):
-            chunk = json.dumps(chunk, ensure_ascii=False, indent=2)
-            chunk = chunk.replace("</", "<\\/") + "\n"
-            self.set_header("Content-Type", "application/json; charset=UTF-8")
+            codec = self.get_response_codec()
+            chunk = codec.encode(chunk)
+            self.set_header("Content-Type", codec.content_type)
         super().write(chunk)
 
+    def flush(self, include_footers: bool = False) -> Future[None]:
+        if self._idempotency is not None:
+            self._idempotency.record(self)
+        return super().flush(include_footers)
+
     def write_error(self, status_code: int, **kwargs: Any) -> Future[None]:
         if "exc_info" in kwargs:
             typ, value, tb = kwargs["exc_info"]
@@ -68,6 +183,125 @@ class APIHandler(tornado.web.RequestHandler):
                         self.write(line)
         return self.finish()
 
+    def on_finish(self) -> None:
+        if self._idempotency is not None:
+            self._idempotency.finish(self)
+            self._idempotency = None
+        if self._deferred:
+            # The action did not complete, e.g. it failed, timed out or was
+            # cancelled because the client went away.
+            failed = self._client_disconnected or self.get_status() >= 500
+            scheduler = get_scheduler()
+            for func, args, kwargs, always in self._deferred:
+                if always or not failed:
+                    scheduler.submit(func, *args, **kwargs)
+                elif asyncio.iscoroutine(func):
+                    func.close()
+            self._deferred = None
+        if self._profiler is not None:
+            self._stop_profiler()
+
+    def defer(
+        self,
+        func: Union[Callable[..., Any], Any],
+        *args: Any,
+        always: bool = False,
+        **kwargs: Any,
+    ) -> None:
+        """Run `func` once the response has been sent.
+
+        `func` is a coroutine, a coroutine function or a plain callable,
+        which is run on a thread pool. Errors are logged. Unless `always`
+        is set, the work is discarded when the response is a server error
+        or the client disconnected before it.
+        """
+        if self._deferred is None:
+            self._deferred = []
+        self._deferred.append((func, args, kwargs, always))
+
+    def on_connection_close(self) -> None:
+        self._client_disconnected = True
+        if self._action_task is not None:
+            self._action_task.cancel()
+        if self._profiler is not None:
+            self._stop_profiler()
+        super().on_connection_close()
+
+    def finish(self, chunk: Union[str, bytes, dict] = None) -> Future[None]:
+        if not self._client_disconnected:
+            return super().finish(chunk)
+        # Nobody is going to read the response, only account for it.
+        future = Future()
+        if not self._finished:
+            self.set_status(499, "Client Closed Request")
+            self._finished = True
+            self._log()
+            self.on_finish()
+        future.set_result(None)
+        return future
+
+    def get_timeout(self, action: str) -> Optional[float]:
+        if action in self.action_timeouts:
+            timeout = self.action_timeouts[action]
+        elif self.timeout is not None:
+            timeout = self.timeout
+        else:
+            timeout = settings.request_timeout
+        return timeout or None
+
+    async def events(self, *args: str, **kwargs: str) -> Future[None]:
+        """Stream the events published to `event_topic` as Server-Sent
+        Events, resuming after the `Last-Event-ID` header if given."""
+        try:
+            last_event_id = int(
+                self.request.headers.get("Last-Event-ID")
+                or self.get_query_argument("last_event_id", None)
+            )
+        except (TypeError, ValueError):
+            last_event_id = None
+        subscription = get_broker().subscribe(
+            self.get_event_topic(*args, **kwargs), last_event_id
+        )
+        self.set_header("Content-Type", "text/event-stream")
+        self.set_header("Cache-Control", "no-cache")
+        self.set_header("X-Accel-Buffering", "no")
+        heartbeat = settings.events_heartbeat_interval or None
+        try:
+            await self.flush()
+            while True:
+                try:
+                    event = await asyncio.wait_for(
+                        subscription.get(), heartbeat
+                    )
+                except asyncio.TimeoutError:
+                    self.write(": heartbeat\n\n")
+                else:
+                    if event is None:
+                        break
+                    self.write(format_event(event))
+                await self.flush()
+        except StreamClosedError:
+            return None
+        finally:
+            subscription.close()
+        return self.finish()
+
+    def get_event_topic(self, *args: str, **kwargs: str) -> str:
+        """Override to have a topic per parent of a nested resource, from
+        the parent lookups only: it is resolved with the arguments of the
+        collection route to subscribe and of any route to publish."""
+        return self.event_topic
+
+    def publish_event(self, type: str, data: Any) -> None:
+        """Publish a change to the topic of the current route.
+
+        Events are deferred until the response has been sent, after the
+        action committed, and dropped when the action fails.
+        """
+        if self.event_topic is not None:
+            topic = self.get_event_topic(*self.path_args, **self.path_kwargs)
+            self.defer(publish, topic, type, data)
+
     @property
     async def current_user(self) -> Any:
         if not hasattr(self, "_current_user"):
@@ -77,30 +311,107 @@ class APIHandler(tornado.web.RequestHandler):
     async def get_current_user(self) -> Any:
         """Override to determine the current user from.
 
-        This method should be a coroutine.
+        This method should be a coroutine. By default the `user_model` row
+        named by the `sub` claim of the JSON web token is loaded through a
+        process-wide TTL cache, see `tornado_restful.auth`.
         """
-        return None
+        if self.user_model is None:
+            return None
+        # Imported here, `shortcuts` pulls in smtplib and email.
+        from tornado_restful.auth import get_user_from_token
+        return await get_user_from_token(
+            self.user_model, self.request.token, self.application.db
+        )
 
     def get_user_locale(self, default: str = "en") -> str:
         if "Accept-Language" in self.request.headers:
-            languages = self.request.headers["Accept-Language"].split(",")
-            locales = []
-            for language in languages:
-                parts = language.strip().split(";")
-                if len(parts) > 1 and parts[1].startswith("q="):
-                    try:
-                        score = float(parts[1][2:])
-                    except (ValueError, TypeError):
-                        score = 0.0
-                else:
-                    score = 1.0
-                locales.append((parts[0], score))
-            if locales:
-                locales.sort(key=lambda pair: pair[1], reverse=True)
-                codes = [l[0] for l in locales]
+            codes = parse_quality_header(
+                self.request.headers["Accept-Language"]
+            )
+            if codes:
                 return codes[0]
         return default
 
+    def get_response_codec(self) -> Codec:
+        if self._response_codec is None:
+            self._response_codec = json_codec
+            if "Accept" in self.request.headers:
+                for media_type in parse_quality_header(
+                    self.request.headers["Accept"]
+                ):
+                    codec = get_codec(media_type)
+                    if codec is not None:
+                        self._response_codec = codec
+                        break
+        # On every call, `clear` drops the headers before an error response.
+        self._add_vary("Accept")
+        return self._response_codec
+
+    def get_renderer(self) -> Renderer:
+        requested = self.get_query_argument("format", None)
+        if requested is not None:
+            for renderer_class in self.renderer_classes:
+                if renderer_class.format == requested:
+                    return renderer_class()
+            raise NotAcceptableError(
+                detail={"format": [f"Unsupported format `{requested}`."]}
+            )
+        self._add_vary("Accept")
+        if "Accept" in self.request.headers:
+            for media_type in parse_quality_header(
+                self.request.headers["Accept"]
+            ):
+                for renderer_class in self.renderer_classes:
+                    if media_type in (renderer_class.media_type, "*/*"):
+                        return renderer_class()
+        return self.renderer_classes[0]()
+
+    async def export(self, query: Any, serializer_class: Any,
+                     **kwargs: Any) -> Future[None]:
+        """Stream the rows of `query` in the negotiated format.
+
+        Rows are fetched, serialized and flushed in chunks of
+        `export_chunk_size`, so the response starts immediately and the
+        memory use does not depend on the number of rows.
+        """
+        renderer = self.get_renderer()
+        serializer = serializer_class(many=True, **kwargs)
+        self.set_header("Content-Type", renderer.content_type)
+        self.write(renderer.start(list(serializer.dump_fields)))
+        chunk_size = self.export_chunk_size or settings.export_chunk_size
+        async for rows in self.iterate_query(query, chunk_size):
+            self.write(renderer.render(serializer.dump(rows)))
+            await self.flush()
+        self.write(renderer.end())
+        return self.finish()
+
+    async def iterate_query(self, query: Any,
+                            chunk_size: int) -> AsyncIterator[List[Any]]:
+        db = self.application.db
+        primary_keys = query.model._meta.get_primary_keys()
+        if query._order_by or len(primary_keys) != 1:
+            offset = 0
+            while True:
+                rows = await db.execute(query.limit(chunk_size).offset(offset))
+                if rows:
+                    yield rows
+                if len(rows) < chunk_size:
+                    return
+                offset += chunk_size
+        # Keyset pagination on the primary key avoids rescanning the skipped
+        # rows of every chunk.
+        primary_key, last = primary_keys[0], None
+        while True:
+            chunk = query.order_by(primary_key).limit(chunk_size)
+            if last is not None:
+                chunk = chunk.where(primary_key > last)
+            rows = await db.execute(chunk)
+            if rows:
+                yield rows
+            if len(rows) < chunk_size:
+                return
+            last = getattr(rows[-1], primary_key.name)
+
     def log_exception(
         self,
         typ: Optional[Type[BaseException]],
@@ -121,23 +432,204 @@ class APIHandler(tornado.web.RequestHandler):
             raise BadRequestError
         return min(settings.page_size, limit), offset
 
+    async def paginate_query(
+        self,
+        query: Any,
+        serializer_class: Any,
+        mode: str = None,
+        **kwargs: Any,
+    ) -> dict:
+        """Fetch the page of `query` selected by `paginate` as a response
+        envelope of the form `{"mode": mode, "total": n, "results": [...]}`.
+
+        `mode` (default `pagination_mode`) is one of:
+
+        * "exact": the page and the `COUNT(*)` queries run concurrently.
+        * "approximate": the total is the row estimate of the query plan.
+        * "has_more": no count, one extra row is fetched to tell whether
+          there is a next page, `total` is replaced by `has_more`.
+        """
+        mode = mode or self.pagination_mode or settings.pagination_mode
+        limit, offset = self.paginate()
+        db = self.application.db
+        envelope = {"mode": mode}
+        if mode == "has_more":
+            rows = list(
+                await db.execute(query.limit(limit + 1).offset(offset))
+            )
+            envelope["has_more"] = len(rows) > limit
+            rows = rows[:limit]
+        elif mode in ("exact", "approximate"):
+            count = self.count_query if mode == "exact" \
+                else self.estimate_query
+            # Outside of a transaction both queries get their own pooled
+            # connection.
+            rows, envelope["total"] = await asyncio.gather(
+                db.execute(query.limit(limit).offset(offset)),
+                count(query),
+            )
+        else:
+            raise AssertionError(f"Unknown pagination mode `{mode}`.")
+        envelope["results"] = serializer_class(rows, many=True, **kwargs).data
+        return envelope
+
+    async def count_query(self, query: Any) -> int:
+        return await self.application.db.count(query.order_by())
+
+    async def estimate_query(self, query: Any) -> int:
+        sql, params = query.order_by().sql()
+        plan = await self.application.db.execute(
+            query.model.raw(f"EXPLAIN {sql}", *params).dicts()
+        )
+        if not plan:
+            return 0
+        # The first table of the plan drives the query, `filtered` is the
+        # percentage of its rows left by the conditions.
+        rows = plan[0].get("rows") or 0
+        return int(rows * float(plan[0].get("filtered") or 100) / 100)
+
+    def filter_query(self, query: Any) -> Any:
+        """Apply the `filter_fields` and `ordering_fields` declared on the
+        handler to a select query, e.g.
+        `self.filter_query(User.select()).limit(limit).offset(offset)`.
+        """
+        spec = self.get_filter_spec(query.model)
+        return spec.apply(query, self.request.query_arguments)
+
+    @classmethod
+    def get_filter_spec(cls, model: Any) -> FilterSpec:
+        specs = cls.__dict__.get("_filter_specs")
+        if specs is None:
+            specs = cls._filter_specs = {}
+        if model not in specs:
+            from tornado_restful.filters import FilterSpec
+            specs[model] = FilterSpec(
+                model,
+                cls.filter_fields,
+                cls.ordering_fields,
+                cls.default_ordering,
+            )
+        return specs[model]
+
+    def get_fieldset(self, serializer_class: Any) -> dict:
+        """Parse the `fields` and `exclude` query arguments.
+
+        The result is passed on to the serializer, e.g.
+        `UserSerializer(users, many=True, **fieldset)`, and to
+        `Serializer.get_columns` to restrict the selected columns.
+        """
+        allowed = self.sparse_fields
+        if allowed is None:
+            allowed = [
+                name
+                for name, field in serializer_class._declared_fields.items()
+                if not field.load_only
+            ]
+        fieldset = {}
+        for argument, option in (("fields", "only"), ("exclude", "exclude")):
+            value = self.get_query_argument(argument, None)
+            if value is None:
+                continue
+            names = tuple(x.strip() for x in value.split(",") if x.strip())
+            invalid = ", ".join(x for x in names if x not in allowed)
+            if invalid:
+                raise BadRequestError(
+                    detail={argument: [f"Unknown field(s): {invalid}."]}
+                )
+            if not names and option == "only":
+                raise BadRequestError(
+                    detail={argument: ["At least one field is required."]}
+                )
+            fieldset[option] = names
+        return fieldset
+
     @property
     def i18n(self) -> I18n:
         if not hasattr(self, "_i18n"):
             self._i18n = I18n(self.locale)
         return self._i18n
 
+    async def _run_action(
+        self,
+        action: Callable[..., Any],
+        timeout: Optional[float],
+        *args: Any,
+        **kwargs: Any,
+    ) -> Any:
+        if self._client_disconnected:
+            # The client went away while the request was being prepared.
+            return None
+        started = time.monotonic()
+        result = action(*args, **kwargs)
+        if not isawaitable(result):
+            self._action_time = time.monotonic() - started
+            return result
+        self._action_task = asyncio.ensure_future(result)
+        try:
+            return await asyncio.wait_for(self._action_task, timeout)
+        except asyncio.TimeoutError:
+            raise GatewayTimeoutError
+        except asyncio.CancelledError:
+            if self._client_disconnected:
+                return None
+            raise
+        finally:
+            self._action_task = None
+            self._action_time = time.monotonic() - started
+
+    def _dispatch_bulk(
+        self,
+        bulk_handler: Callable[..., Any],
+        handler: Optional[Callable[..., Any]],
+        *args: Any,
+        **kwargs: Any,
+    ) -> Any:
+        if handler is None or isinstance(self.request.data, list):
+            return bulk_handler(*args, **kwargs)
+        return handler(*args, **kwargs)
+
+    def _add_vary(self, name: str) -> None:
+        # Shared caches must not serve a body negotiated for other headers.
+        if name not in self._headers.get_list("Vary"):
+            self.add_header("Vary", name)
+
     def _parse_request_body(self):
-        content_type = self.request.headers.get("Content-Type")
-        if not content_type == "application/json":
+        content_type = self.request.headers.get("Content-Type", "")
+        codec = get_codec(content_type.split(";")[0].strip())
+        if codec is None:
             return None
         try:
-            request_body = self.request.body.decode("utf-8")
-            request_data = json.loads(request_body)
-        except json.JSONDecodeError:
+            request_data = codec.decode(self.request.body)
+        except ValueError:
             raise BadRequestError
         return request_data
 
+    def _should_profile(self) -> bool:
+        if settings.profile_token:
+            flag = self.request.headers.get(
+                settings.profile_header
+            ) or self.get_query_argument(settings.profile_query_argument, "")
+            # `compare_digest` only accepts ASCII strings, bytes always work.
+            if flag and hmac.compare_digest(
+                flag.encode(), settings.profile_token.encode()
+            ):
+                return True
+        sample_rate = self.profile_sample_rate
+        if sample_rate is None:
+            sample_rate = settings.profile_sample_rate
+        return sample_rate > 0 and random.random() < sample_rate
+
+    def _stop_profiler(self) -> None:
+        profiler, self._profiler = self._profiler, None
+        path = profiling.stop_profiler(
+            profiler,
+            settings.profile_output_dir or tempfile.gettempdir(),
+            f"{self.request.method}-{type(self).__name__}",
+        )
+        app_log.info(
+            "Profiled %s %s to %s", self.request.method, self.request.uri, path
+        )
+
     def _parse_request_token(self) -> Optional[str]:
         if "Authorization" in self.request.headers:
             auth_header = self.request.headers["Authorization"]
@@ -150,6 +642,100 @@ class APIHandler(tornado.web.RequestHandler):
         return None
 
 
+@tornado.web.stream_request_body
+class StreamingAPIHandler(APIHandler):
+    """Ingest NDJSON or JSON array uploads while they are being received.
+
+    Records are validated with `serializer_class` and inserted into `model`
+    every `stream_batch_size` records, so memory use is bounded by the batch
+    size rather than by the size of the body. Batches are committed as they
+    are flushed, a failing record does not roll back earlier batches.
+    """
+    model = None
+    serializer_class = None
+    stream_batch_size = None
+    stream_max_body_size = None
+    stream_max_record_size = 1024 * 1024
+
+    _parser = None
+    _stream_error = None
+
+    async def data_received(self, chunk: bytes) -> None:
+        if self._parser is None or self._stream_error is not None:
+            return
+        try:
+            await self.receive_records(self._parser.feed(chunk))
+        except APIException as e:
+            self._stream_error = e
+
+    async def create(self) -> Future[None]:
+        if self._parser is None:
+            raise UnsupportedMediaTypeError
+        if self._stream_error is None:
+            await self.receive_records(self._parser.close(), flush=True)
+        if self._stream_error is not None:
+            raise self._stream_error
+        self.set_status(status.HTTP_201_CREATED)
+        return self.finish({"total": self._saved})
+
+    async def receive_records(
+        self, records: List[Any], flush: bool = False
+    ) -> None:
+        self._records.extend(records)
+        batch_size = self.stream_batch_size or settings.stream_batch_size
+        while len(self._records) >= batch_size or (flush and self._records):
+            batch = self._records[:batch_size]
+            del self._records[:batch_size]
+            serializer = self.serializer_class(data=batch, many=True)
+            if not serializer.is_valid():
+                raise BadRequestError(
+                    detail={
+                        self._saved + index: errors
+                        for index, errors in serializer.errors.items()
+                    }
+                )
+            await self.save_records(serializer.validated_data)
+            self._saved += len(batch)
+
+    async def save_records(self, validated_data: List[dict]) -> None:
+        """Override to customize how a validated batch is stored."""
+        await self.application.db.execute(
+            self.model.insert_many(validated_data)
+        )
+
+    def _parse_request_body(self) -> None:
+        self._records, self._saved = [], 0
+        if self.request.method not in ("POST", "PUT", "PATCH"):
+            return None
+        content_type = self.request.headers.get("Content-Type", "")
+        parser_class = parsers.get(content_type.split(";")[0].strip())
+        if parser_class is None:
+            raise UnsupportedMediaTypeError
+        self._parser = parser_class(self.stream_max_record_size)
+        max_body_size = self.stream_max_body_size \
+            or settings.stream_max_body_size
+        if max_body_size:
+            self.request.connection.set_max_body_size(max_body_size)
+        return None
+
+
+def parse_quality_header(value: str) -> List[str]:
+    items = []
+    for item in value.split(","):
+        parts = item.strip().split(";")
+        score = 1.0
+        for param in parts[1:]:
+            param = param.strip()
+            if param.startswith("q="):
+                try:
+                    score = float(param[2:])
+                except (ValueError, TypeError):
+                    score = 0.0
+        items.append((parts[0].strip(), score))
+    items.sort(key=lambda pair: pair[1], reverse=True)
+    return [x[0] for x in items if x[0]]
+
+
 class NotFoundHandler(tornado.web.RequestHandler):
     def prepare(self) -> Optional[Awaitable[None]]:
         self.set_status(status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,224 @@
+import asyncio
+import hashlib
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+)
+
+from tornado.log import app_log
+
+from tornado_restful.cache import TTLCache
+from tornado_restful.conf import settings
+from tornado_restful.exceptions import (
+    BadRequestError,
+    ConflictError,
+    UnprocessableEntityError,
+)
+from tornado_restful.middleware import Middleware
+
+POLL_INTERVAL = 0.1
+REPLAY_HEADERS = ("Content-Type", "Content-Language", "Location")
+
+
+class IdempotencyStore:
+    """Storage of the responses to idempotent requests.
+
+    Records are dicts of plain values and bytes. `add` must be atomic, it
+    stores a record only if the key is absent; a shared backend (e.g. Redis
+    `SET NX PX`) makes duplicates wait across processes.
+    """
+    async def get(self, key: str) -> Optional[dict]:
+        raise NotImplementedError("`get` must be overridden.")
+
+    async def add(self, key: str, record: dict, ttl: float) -> bool:
+        raise NotImplementedError("`add` must be overridden.")
+
+    async def set(self, key: str, record: dict, ttl: float) -> None:
+        raise NotImplementedError("`set` must be overridden.")
+
+    async def delete(self, key: str) -> None:
+        raise NotImplementedError("`delete` must be overridden.")
+
+
+class MemoryIdempotencyStore(IdempotencyStore):
+    def __init__(self, maxsize: int = 10000) -> None:
+        self.cache = TTLCache(maxsize=maxsize)
+
+    async def get(self, key: str) -> Optional[dict]:
+        return self.cache.get(key)
+
+    async def add(self, key: str, record: dict, ttl: float) -> bool:
+        if self.cache.get(key) is not None:
+            return False
+        self.cache.set(key, record, ttl)
+        return True
+
+    async def set(self, key: str, record: dict, ttl: float) -> None:
+        self.cache.set(key, record, ttl)
+
+    async def delete(self, key: str) -> None:
+        self.cache.invalidate(key)
+
+
+_store = None
+
+
+def get_store() -> IdempotencyStore:
+    global _store
+    if _store is None:
+        _store = MemoryIdempotencyStore(settings.idempotency_cache_size)
+    return _store
+
+
+class IdempotentResponse:
+    """Records the response of the first request with a key."""
+    def __init__(
+        self,
+        middleware: "IdempotencyMiddleware",
+        store: IdempotencyStore,
+        key: str,
+        fingerprint: str,
+    ) -> None:
+        self.middleware = middleware
+        self.store = store
+        self.key = key
+        self.fingerprint = fingerprint
+        self.chunks: List[bytes] = []
+
+    def record(self, handler: Any) -> None:
+        self.chunks.extend(handler._write_buffer)
+
+    def finish(self, handler: Any) -> None:
+        status_code = handler.get_status()
+        if handler._client_disconnected or status_code >= 500:
+            # Let a retry run the action again.
+            save = self.store.delete(self.key)
+        else:
+            headers = [
+                (name, handler._headers[name]) for name in REPLAY_HEADERS
+                if name in handler._headers
+            ]
+            record = dict(
+                fingerprint=self.fingerprint,
+                status=status_code,
+                reason=handler._reason,
+                headers=headers,
+                body=b"".join(self.chunks),
+            )
+            save = self.store.set(self.key, record, settings.idempotency_ttl)
+        asyncio.ensure_future(self._save(save))
+
+    async def _save(self, save: Any) -> None:
+        try:
+            await save
+        except Exception:
+            app_log.exception("Could not store idempotent response")
+            try:
+                await self.store.delete(self.key)
+            except Exception:
+                pass
+        finally:
+            self.middleware.release(self.key)
+
+
+class IdempotencyMiddleware(Middleware):
+    """Replays the stored response of requests that repeat an
+    `Idempotency-Key` header instead of running the action again.
+
+    Keys are scoped by method, path and `Authorization` header, reusing a
+    key with a different body is rejected. Duplicates of a request that is
+    still running wait for its response up to `idempotency_wait_timeout`.
+    """
+    methods = ("POST", "PATCH")
+
+    def __init__(self, store: IdempotencyStore = None) -> None:
+        self.store = store
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    def process_request(self, handler: Any) -> Optional[Any]:
+        value = handler.request.headers.get(settings.idempotency_header)
+        if value is None:
+            return None
+        if not value or len(value) > 255:
+            raise BadRequestError(
+                detail={
+                    settings.idempotency_header:
+                    ["Must be between 1 and 255 characters."]
+                }
+            )
+        return self._process(handler, value)
+
+    def get_key(self, handler: Any, value: str) -> str:
+        request = handler.request
+        return hashlib.sha256(
+            "\n".join(
+                (
+                    request.method,
+                    request.path,
+                    request.headers.get("Authorization", ""),
+                    value,
+                )
+            ).encode()
+        ).hexdigest()
+
+    def release(self, key: str) -> None:
+        future = self._inflight.pop(key, None)
+        if future is not None and not future.done():
+            future.set_result(None)
+
+    async def _process(self, handler: Any, value: str) -> None:
+        store = self.store or get_store()
+        key = self.get_key(handler, value)
+        fingerprint = hashlib.sha256(handler.request.body).hexdigest()
+        loop = asyncio.get_event_loop()
+        deadline = loop.time() + settings.idempotency_wait_timeout
+        while True:
+            if await store.add(
+                key,
+                {"fingerprint": fingerprint},
+                settings.idempotency_lock_ttl,
+            ):
+                self._inflight[key] = loop.create_future()
+                handler._idempotency = IdempotentResponse(
+                    self, store, key, fingerprint
+                )
+                return
+            record = await store.get(key)
+            if record is None:
+                continue
+            if record["fingerprint"] != fingerprint:
+                raise UnprocessableEntityError(
+                    detail={
+                        settings.idempotency_header:
+                        ["Already used with a different request body."]
+                    }
+                )
+            if "status" in record:
+                self.replay(handler, record)
+                return
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                raise ConflictError(
+                    detail={
+                        settings.idempotency_header:
+                        ["A request with this key is still in progress."]
+                    }
+                )
+            future = self._inflight.get(key)
+            if future is None:
+                # Running in another process, poll the store.
+                await asyncio.sleep(min(POLL_INTERVAL, remaining))
+                continue
+            try:
+                await asyncio.wait_for(asyncio.shield(future), remaining)
+            except asyncio.TimeoutError:
+                pass
+
+    def replay(self, handler: Any, record: dict) -> None:
+        handler.set_status(record["status"], record["reason"])
+        for name, value in record["headers"]:
+            handler.set_header(name, value)
+        handler.set_header("Idempotent-Replayed", "true")
+        handler.finish(record["body"])
@@ -0,0 +1,118 @@
+from inspect import isawaitable
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from tornado_restful.conf import settings
+
+METHODS = ("GET", "HEAD", "POST", "DELETE", "PATCH", "PUT", "OPTIONS")
+
+
+class Middleware:
+    """A step run by `APIHandler.prepare` before the action.
+
+    `methods` restricts the step to some request methods and `skip_methods`
+    excludes some. A step short-circuits the rest of the pipeline (and the
+    action) by finishing the response.
+    """
+    methods = None
+    skip_methods = ()
+
+    def applies_to(self, method: str) -> bool:
+        if self.methods is not None and method not in self.methods:
+            return False
+        return method not in self.skip_methods
+
+    def process_request(self, handler: Any) -> Optional[Awaitable[None]]:
+        raise NotImplementedError("`process_request` must be overridden.")
+
+
+class PreflightMiddleware(Middleware):
+    """Answers OPTIONS with the handler's `options` before the rest of the
+    pipeline, which e.g. must not authenticate preflight requests."""
+    methods = ("OPTIONS", )
+
+    def process_request(self, handler: Any) -> Optional[Awaitable[None]]:
+        if settings.cors_max_age:
+            handler.set_header(
+                "Access-Control-Max-Age", str(settings.cors_max_age)
+            )
+        result = handler.options(*handler.path_args, **handler.path_kwargs)
+        if result is not None and isawaitable(result):
+            return self._finish(handler, result)
+        if not handler._finished:
+            handler.finish()
+        return None
+
+    async def _finish(self, handler: Any, result: Awaitable[None]) -> None:
+        await result
+        if not handler._finished:
+            handler.finish()
+
+
+class RequestBodyMiddleware(Middleware):
+    skip_methods = ("HEAD", "OPTIONS")
+
+    def process_request(self, handler: Any) -> None:
+        handler.request.data = handler._parse_request_body()
+
+
+class RequestTokenMiddleware(Middleware):
+    skip_methods = ("HEAD", "OPTIONS")
+
+    def process_request(self, handler: Any) -> None:
+        handler.request.token = handler._parse_request_token()
+
+
+class Pipeline:
+    """Middleware compiled into a fixed chain of steps per request method."""
+    def __init__(
+        self, middleware: Iterable[Union[Middleware, type]] = ()
+    ) -> None:
+        self.middleware = tuple(
+            x() if isinstance(x, type) else x for x in middleware
+        )
+        self.chains: Dict[str, Tuple[Callable[..., Any], ...]] = {
+            method: tuple(
+                x.process_request for x in self.middleware
+                if x.applies_to(method)
+            )
+            for method in METHODS
+        }
+
+    def __call__(self, handler: Any) -> Optional[Awaitable[None]]:
+        chain = self.chains.get(handler.request.method, ())
+        for index, step in enumerate(chain):
+            result = step(handler)
+            if result is not None and isawaitable(result):
+                return self._resume(handler, chain[index + 1:], result)
+            if handler._finished:
+                break
+        return None
+
+    async def _resume(
+        self,
+        handler: Any,
+        chain: Tuple[Callable[..., Any], ...],
+        result: Awaitable[None],
+    ) -> None:
+        await result
+        for step in chain:
+            if handler._finished:
+                return
+            result = step(handler)
+            if result is not None and isawaitable(result):
+                await result
+
+
+def compile_middleware(middleware: Any) -> Pipeline:
+    if isinstance(middleware, Pipeline):
+        return middleware
+    return Pipeline(middleware)
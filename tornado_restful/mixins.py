@@ -0,0 +1,181 @@
+from asyncio import Future
+from typing import (
+    Any,
+    Iterator,
+    List,
+)
+
+from peewee import Case, Value
+
+from tornado_restful import status
+from tornado_restful.conf import settings
+from tornado_restful.exceptions import BadRequestError, NotFoundError
+
+
+class BulkMixin:
+    """Base implementations of the bulk actions routed by `NestedRouter`.
+
+    Every action runs in a single transaction and issues one statement per
+    batch of `bulk_batch_size` rows. With an `event_topic`, updated and
+    deleted rows are published; `bulk_create` publishes nothing as the
+    keys of the inserted rows are unknown.
+    """
+    model = None
+    serializer_class = None
+    bulk_lookup_field = "id"
+    bulk_max_size = None
+    bulk_batch_size = None
+
+    async def bulk_create(self, *args: str, **kwargs: str) -> Future[None]:
+        data = self.get_bulk_data()
+        serializer = self.serializer_class(data=data, many=True)
+        serializer.is_valid(raise_exception=True)
+        defaults = self.get_bulk_defaults(*args, **kwargs)
+        rows = [dict(x, **defaults) for x in serializer.validated_data]
+        db = self.application.db
+        async with db.atomic():
+            for batch in self.get_batches(rows):
+                await db.execute(self.model.insert_many(batch))
+        self.set_status(status.HTTP_201_CREATED)
+        return self.finish({"total": len(rows)})
+
+    async def bulk_update(self, *args: str, **kwargs: str) -> Future[None]:
+        return await self._bulk_update(False, *args, **kwargs)
+
+    async def bulk_partial_update(self, *args: str,
+                                  **kwargs: str) -> Future[None]:
+        return await self._bulk_update(True, *args, **kwargs)
+
+    async def bulk_destroy(self, *args: str, **kwargs: str) -> Future[None]:
+        if self.request.data is None:
+            ids = self.get_query_argument("ids", "")
+            data = [x for x in ids.split(",") if x]
+        else:
+            data = self.request.data
+        pks = self.get_bulk_pks(self.get_bulk_data(data))
+        lookup = getattr(self.model, self.bulk_lookup_field)
+        scope = self.get_bulk_query(*args, **kwargs)
+        db = self.application.db
+        deleted = []
+        async with db.atomic():
+            for batch in self.get_batches(pks):
+                # Rows outside of the scope are left alone like missing ones.
+                ids = await self.get_bulk_ids(scope, batch)
+                if ids:
+                    await db.execute(
+                        self.model.delete().where(lookup.in_(ids))
+                    )
+                deleted += ids
+        for pk in deleted:
+            self.publish_event("deleted", {self.bulk_lookup_field: pk})
+        self.set_status(status.HTTP_204_NO_CONTENT)
+        return self.finish()
+
+    def get_bulk_query(self, *args: str, **kwargs: str) -> Any:
+        """Return the rows the bulk actions may change, override to scope
+        nested resources, e.g.
+        `Post.select().where(Post.user == kwargs["user_pk"])`.
+        """
+        return self.model.select()
+
+    def get_bulk_defaults(self, *args: str, **kwargs: str) -> dict:
+        """Return column values forced on created and updated rows, e.g.
+        `{"user": kwargs["user_pk"]}` for a nested resource.
+        """
+        return {}
+
+    async def get_bulk_ids(self, scope: Any, pks: List[Any]) -> List[Any]:
+        lookup = getattr(self.model, self.bulk_lookup_field)
+        query = scope.select(lookup).where(lookup.in_(pks))
+        if self.model._meta.database.for_update:
+            # Keeps the rows in the scope until the transaction ends.
+            query = query.for_update()
+        rows = await self.application.db.execute(query.tuples())
+        return [x for x, in rows]
+
+    def get_bulk_data(self, data: Any = None) -> list:
+        data = self.request.data if data is None else data
+        if not isinstance(data, list) or not data:
+            raise BadRequestError(
+                detail={"_schema": ["Expected a non-empty list of items."]}
+            )
+        max_size = self.bulk_max_size or settings.bulk_max_size
+        if len(data) > max_size:
+            raise BadRequestError(
+                detail={"_schema": [f"Expected at most {max_size} items."]}
+            )
+        return data
+
+    def get_bulk_pks(self, data: list) -> list:
+        pks = []
+        for item in data:
+            pk = item.get(self.bulk_lookup_field) \
+                if isinstance(item, dict) else item
+            if pk is None or isinstance(pk, (dict, list)):
+                raise BadRequestError(
+                    detail={
+                        self.bulk_lookup_field:
+                        ["Missing data for required field."]
+                    }
+                )
+            pks.append(pk)
+        if len(set(pks)) != len(pks):
+            raise BadRequestError(
+                detail={self.bulk_lookup_field: ["Duplicated value."]}
+            )
+        return pks
+
+    def get_batches(self, items: List[Any]) -> Iterator[List[Any]]:
+        size = self.bulk_batch_size or settings.bulk_batch_size
+        for i in range(0, len(items), size):
+            yield items[i:i + size]
+
+    async def _bulk_update(self, partial: bool, *args: str,
+                           **kwargs: str) -> Future[None]:
+        data = self.get_bulk_data()
+        pks = self.get_bulk_pks(data)
+        serializer = self.serializer_class(
+            data=data, many=True, partial=partial
+        )
+        serializer.is_valid(raise_exception=True)
+        fields = self.model._meta.fields
+        lookup = getattr(self.model, self.bulk_lookup_field)
+        scope = self.get_bulk_query(*args, **kwargs)
+        defaults = self.get_bulk_defaults(*args, **kwargs)
+        db = self.application.db
+        results = []
+        async with db.atomic():
+            items = [
+                (pk, dict(values, **defaults))
+                for pk, values in zip(pks, serializer.validated_data)
+            ]
+            for batch in self.get_batches(items):
+                ids = [pk for pk, _ in batch]
+                if len(await self.get_bulk_ids(scope, ids)) != len(ids):
+                    raise NotFoundError
+                # One `UPDATE ... SET col = CASE pk WHEN ... END` per batch.
+                columns = {key for _, values in batch for key in values}
+                updates = {}
+                for column in columns & set(fields):
+                    field = fields[column]
+                    updates[field] = Case(
+                        lookup,
+                        [
+                            (pk, Value(values[column], field.db_value))
+                            for pk, values in batch if column in values
+                        ],
+                        field,
+                    )
+                if updates:
+                    await db.execute(
+                        self.model.update(updates).where(lookup.in_(ids))
+                    )
+                results += await db.execute(
+                    self.model.select().where(lookup.in_(ids))
+                )
+        serializer = self.serializer_class(results, many=True)
+        if self.event_topic is not None:
+            for item in serializer.data:
+                self.publish_event("updated", item)
+        self.set_status(status.HTTP_200_OK)
+        return self.finish({"total": len(results), "results": serializer.data})
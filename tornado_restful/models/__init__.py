@@ -9,7 +9,7 @@ from peewee import (
     ProgrammingError,
 )
 
-from tornado_restful.models.base import Model, database, db
+from tornado_restful.models.base import Model, database, db, setup
 from tornado_restful.models.fields import *  # NOQA
 
 __all__ = [
@@ -24,4 +24,5 @@ __all__ = [
     "Model",
     "database",
     "db",
+    "setup",
 ]
@@ -1,20 +1,41 @@
+import asyncio
+
 import peewee
 import peewee_async
 
 from tornado_restful.conf import settings
 
-database = peewee_async.MySQLDatabase(
-    host=settings.mysql_host,
-    port=settings.mysql_port,
-    user=settings.mysql_username,
-    password=settings.mysql_password,
-    database=settings.mysql_dbname,
-)
+
+class Database(peewee_async.PooledMySQLDatabase):
+    """Declared uninitialized so that importing the models does not require
+    settings, initialized by `setup()` at the latest when the first
+    connection is opened."""
+    async def connect_async(
+        self, loop: asyncio.AbstractEventLoop = None, timeout: float = None
+    ) -> None:
+        if self.deferred:
+            setup()
+        return await super().connect_async(loop, timeout)
+
+
+database = Database(None)
 database.set_allow_sync(False)
 
 db = peewee_async.Manager(database)
 
 
+def setup() -> peewee_async.Manager:
+    database.init(
+        settings.mysql_dbname,
+        host=settings.mysql_host,
+        port=settings.mysql_port,
+        user=settings.mysql_username,
+        password=settings.mysql_password,
+        max_connections=settings.mysql_max_connections,
+    )
+    return db
+
+
 class Model(peewee.Model):
     class Meta:
         database = database
@@ -1,7 +1,6 @@
 from enum import IntEnum
 from typing import Any
 
-from passlib.hash import pbkdf2_sha256
 from peewee import (
     OP,
     AutoField,
@@ -108,4 +107,5 @@ class EnumField(IntegerField):
 
 class PasswordField(CharField):
     def db_value(self, value: str) -> str:
+        from passlib.hash import pbkdf2_sha256
         return pbkdf2_sha256.hash(value)
@@ -0,0 +1,130 @@
+import codecs
+import json
+from typing import Any, List
+
+from tornado_restful.exceptions import BadRequestError
+
+NUMBER_CHARS = frozenset("0123456789+-.eE")
+
+
+class StreamParser:
+    media_type = ""
+
+    def __init__(self, max_record_size: int = 1024 * 1024) -> None:
+        self.max_record_size = max_record_size
+        self.count = 0
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        raise NotImplementedError("`feed` must be overridden.")
+
+    def close(self) -> List[Any]:
+        raise NotImplementedError("`close` must be overridden.")
+
+    def error(self, message: str) -> BadRequestError:
+        return BadRequestError(detail={"_schema": [message]})
+
+
+class NDJSONParser(StreamParser):
+    media_type = "application/x-ndjson"
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.buffer = b""
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        lines = (self.buffer + chunk).split(b"\n")
+        self.buffer = lines.pop()
+        if len(self.buffer) > self.max_record_size:
+            raise self.error(f"Record {self.count} is too large.")
+        return self._decode(lines)
+
+    def close(self) -> List[Any]:
+        lines, self.buffer = [self.buffer], b""
+        return self._decode(lines)
+
+    def _decode(self, lines: List[bytes]) -> List[Any]:
+        records = []
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                raise self.error(f"Record {self.count} is not valid JSON.")
+            self.count += 1
+        return records
+
+
+class JSONArrayParser(StreamParser):
+    media_type = "application/json"
+
+    START, FIRST, ITEM, SEPARATOR, END = range(5)
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.buffer = ""
+        self.state = self.START
+        self.decoder = json.JSONDecoder()
+        self.charset = codecs.getincrementaldecoder("utf-8")()
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        try:
+            self.buffer += self.charset.decode(chunk)
+        except UnicodeDecodeError:
+            raise self.error("Request body is not valid UTF-8.")
+        records = self._decode(final=False)
+        if len(self.buffer) > self.max_record_size:
+            raise self.error(f"Record {self.count} is too large.")
+        return records
+
+    def close(self) -> List[Any]:
+        records = self._decode(final=True)
+        if self.state != self.END:
+            raise self.error("Unexpected end of JSON array.")
+        return records
+
+    def _decode(self, final: bool) -> List[Any]:
+        buffer, pos, records = self.buffer, 0, []
+        while True:
+            while pos < len(buffer) and buffer[pos].isspace():
+                pos += 1
+            if pos == len(buffer):
+                break
+            char = buffer[pos]
+            if self.state == self.START:
+                if char != "[":
+                    raise self.error("Expected a JSON array.")
+                self.state, pos = self.FIRST, pos + 1
+            elif self.state == self.FIRST and char == "]":
+                self.state, pos = self.END, pos + 1
+            elif self.state in (self.FIRST, self.ITEM):
+                try:
+                    record, end = self.decoder.raw_decode(buffer, pos)
+                except ValueError:
+                    if final:
+                        raise self.error(
+                            f"Record {self.count} is not valid JSON."
+                        )
+                    break
+                # A number ending at the end of the buffer or before `.`,
+                # `e` or a digit may be truncated, wait for the next chunk.
+                if not final and (
+                    end == len(buffer) or buffer[end] in NUMBER_CHARS
+                ):
+                    break
+                records.append(record)
+                self.count += 1
+                self.state, pos = self.SEPARATOR, end
+            elif self.state == self.SEPARATOR and char in ",]":
+                self.state = self.ITEM if char == "," else self.END
+                pos += 1
+            else:
+                raise self.error(f"Unexpected character {char!r}.")
+        self.buffer = buffer[pos:]
+        return records
+
+
+parsers = {
+    NDJSONParser.media_type: NDJSONParser,
+    JSONArrayParser.media_type: JSONArrayParser,
+}
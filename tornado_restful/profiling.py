@@ -0,0 +1,110 @@
+import cProfile
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Optional
+
+# Profilers observe the whole event loop thread, so only one request at a
+# time is profiled per process; concurrent requests are skipped.
+_lock = threading.Lock()
+_active = None
+
+
+class Profiler:
+    extension = ""
+
+    def start(self) -> None:
+        raise NotImplementedError("`start` must be overridden.")
+
+    def stop(self) -> None:
+        raise NotImplementedError("`stop` must be overridden.")
+
+    def dump(self, path: str) -> None:
+        raise NotImplementedError("`dump` must be overridden.")
+
+
+class CProfileProfiler(Profiler):
+    extension = ".prof"
+
+    def __init__(self) -> None:
+        self.profile = cProfile.Profile()
+
+    def start(self) -> None:
+        self.profile.enable()
+
+    def stop(self) -> None:
+        self.profile.disable()
+
+    def dump(self, path: str) -> None:
+        self.profile.dump_stats(path)
+
+
+class SamplingProfiler(Profiler):
+    extension = ".folded"
+
+    def __init__(self, interval: float = 0.001) -> None:
+        self.interval = interval
+        self.stacks = Counter()
+        self._thread_id = threading.get_ident()
+        self._stopped = threading.Event()
+        self._sampler = threading.Thread(target=self._sample, daemon=True)
+
+    def start(self) -> None:
+        self._sampler.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._sampler.join()
+
+    def dump(self, path: str) -> None:
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+    def _sample(self) -> None:
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(
+                    f"{code.co_name} ({code.co_filename}:{frame.f_lineno})"
+                )
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+
+profilers = {
+    "pstats": CProfileProfiler,
+    "collapsed": SamplingProfiler,
+}
+
+
+def start_profiler(kind: str = "pstats") -> Optional[Profiler]:
+    global _active
+    with _lock:
+        if _active is not None:
+            return None
+        _active = profilers[kind]()
+    _active.start()
+    return _active
+
+
+def stop_profiler(profiler: Profiler, output_dir: str, name: str) -> str:
+    global _active
+    profiler.stop()
+    with _lock:
+        _active = None
+    os.makedirs(output_dir, exist_ok=True)
+    filename = "{}-{}-{}{}".format(
+        time.strftime("%Y%m%dT%H%M%S"),
+        name,
+        os.getpid(),
+        profiler.extension,
+    )
+    path = os.path.join(output_dir, filename)
+    profiler.dump(path)
+    return path
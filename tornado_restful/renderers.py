@@ -0,0 +1,88 @@
+import csv
+import io
+import json
+from typing import Any, List
+
+from tornado_restful.codecs import encode_default
+
+
+class Renderer:
+    media_type = ""
+    format = ""
+    charset = "UTF-8"
+
+    @property
+    def content_type(self) -> str:
+        return f"{self.media_type}; charset={self.charset}"
+
+    def start(self, fields: List[str]) -> str:
+        return ""
+
+    def render(self, rows: List[dict]) -> str:
+        raise NotImplementedError("`render` must be overridden.")
+
+    def end(self) -> str:
+        return ""
+
+
+class JSONRenderer(Renderer):
+    media_type = "application/json"
+    format = "json"
+
+    def __init__(self) -> None:
+        self.separator = "\n"
+
+    def start(self, fields: List[str]) -> str:
+        return "["
+
+    def render(self, rows: List[dict]) -> str:
+        if not rows:
+            return ""
+        chunk = self.separator + ",\n".join(
+            json.dumps(row, ensure_ascii=False, default=encode_default)
+            for row in rows
+        )
+        self.separator = ",\n"
+        return chunk.replace("</", "<\\/")
+
+    def end(self) -> str:
+        return "\n]\n"
+
+
+class NDJSONRenderer(Renderer):
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+
+    def render(self, rows: List[dict]) -> str:
+        return "".join(
+            json.dumps(row, ensure_ascii=False, default=encode_default) + "\n"
+            for row in rows
+        )
+
+
+class CSVRenderer(Renderer):
+    media_type = "text/csv"
+    format = "csv"
+
+    def __init__(self) -> None:
+        self.fields = []
+
+    def start(self, fields: List[str]) -> str:
+        self.fields = fields
+        return self.render([dict(zip(fields, fields))])
+
+    def render(self, rows: List[dict]) -> str:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow([self._to_cell(row.get(x)) for x in self.fields])
+        return buffer.getvalue()
+
+    def _to_cell(self, value: Any) -> Any:
+        if value is None:
+            return ""
+        if isinstance(value, (dict, list)):
+            return json.dumps(
+                value, ensure_ascii=False, default=encode_default
+            )
+        return value
@@ -10,7 +10,8 @@ from typing import (
 )
 
 import tornado.web
-from inflection import singularize
+
+from tornado_restful.middleware import compile_middleware
 
 Route = namedtuple("Route", ("detail", "mapping"))
 RouteRule = namedtuple("RouteRule", ("pattern", "handler", "kwargs", "name"))
@@ -40,10 +41,18 @@ class Router:
     def rules(self) -> List[tornado.web.url]:
         self._rules = []
         for pattern, handler, kwargs, name in self.get_rules():
+            if kwargs and "middleware" in kwargs:
+                kwargs = dict(
+                    kwargs,
+                    middleware=compile_middleware(kwargs["middleware"])
+                )
             trailing_slash = "/" if self.trailing_slash else ""
             pattern = os.path.join(
                 self.api_prefix, pattern.strip("/")
             ) + trailing_slash
+            if hasattr(handler, "route"):
+                # Reported by the access log instead of the request path.
+                kwargs = dict(kwargs or {}, route=pattern)
             self._rules.append(tornado.web.url(pattern, handler, kwargs, name))
         return self._rules
 
@@ -75,6 +84,13 @@ class NestedRouter(Router):
             },
         )
     ]
+    bulk_mapping = {
+        "post": "bulk_create",
+        "put": "bulk_update",
+        "patch": "bulk_partial_update",
+        "delete": "bulk_destroy",
+    }
+    events_suffix = "events"
 
     def register(
         self,
@@ -98,16 +114,40 @@ class NestedRouter(Router):
             zipped = zip(resources, regexs)
             flat = tuple(itertools.chain.from_iterable(zipped))
             standalone = getattr(handler, "standalone", False)
+            if getattr(handler, "event_topic", None) and not standalone:
+                # Registered before the detail route, which would take
+                # `events` for a lookup value.
+                pattern = "/".join(flat[:-1] + (self.events_suffix, ))
+                rules.append(
+                    RouteRule(
+                        pattern,
+                        handler,
+                        dict(
+                            kwargs,
+                            method_map={"get": "events"},
+                            bulk_method_map={},
+                            timeout=0,
+                        ),
+                        f"{name}-events" if name else None,
+                    )
+                )
             for route in self.routes:
                 method_map = self.get_method_map(handler, route.mapping)
-                if not method_map:
+                bulk_method_map = {}
+                if not route.detail:
+                    bulk_method_map = self.get_method_map(
+                        handler, self.bulk_mapping
+                    )
+                if not method_map and not bulk_method_map:
                     continue
                 if standalone and not route.detail:
                     continue
                 pattern = "/".join(
                     flat if route.detail and not standalone else flat[:-1]
                 )
-                kwargs.update(method_map=method_map)
+                kwargs.update(
+                    method_map=method_map, bulk_method_map=bulk_method_map
+                )
                 rules.append(RouteRule(pattern, handler, kwargs.copy(), name))
         return rules
 
@@ -125,6 +165,7 @@ class NestedRouter(Router):
             if len(resources) == 1:
                 lookup_url_kwargs = (lookup_url_kwarg, )
             else:
+                from inflection import singularize
                 lookup_url_kwargs = (
                     singularize(x) + "_" + lookup_url_kwarg for x in resources
                 )
@@ -1,5 +1,14 @@
+from __future__ import annotations
+
 from inspect import isawaitable
-from typing import Any, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Iterable,
+    List,
+    Optional,
+    Union,
+)
 
 from marshmallow import (
     EXCLUDE,
@@ -21,9 +30,11 @@ from marshmallow import (
 from marshmallow.schema import BaseSchema
 from marshmallow.schema import SchemaMeta as _SchemaMeta
 
-from tornado_restful.models import Model
 from tornado_restful.exceptions import BadRequestError
 
+if TYPE_CHECKING:
+    from tornado_restful.models import Model
+
 __all__ = [
     "EXCLUDE",
     "INCLUDE",
@@ -102,7 +113,8 @@ class Serializer(BaseSchema, metaclass=SchemaMeta):
         assert not self.errors, (
             "You cannot call `.save()` on a serializer with invalid data."
         )
-        if self.instance is None:
+        created = self.instance is None
+        if created:
             instance = self.create(self.validated_data)
             assert instance is not None, (
                 "`create()` did not return an object instance."
@@ -113,6 +125,15 @@ class Serializer(BaseSchema, metaclass=SchemaMeta):
                 "`update()` did not return an object instance."
             )
         self.instance = await instance if isawaitable(instance) else instance
+        # A handler passed as `context={"handler": self}` publishes the
+        # changes to its `event_topic` once the response has been sent.
+        handler = self.context.get("handler")
+        if handler is not None and handler.event_topic is not None:
+            self._data = self.dump(self.instance)
+            for item in self._data if self.many else (self._data, ):
+                handler.publish_event(
+                    "created" if created else "updated", item
+                )
         return self.instance
 
     def create(self, validated_data: Union[list, dict]) -> Model:
@@ -146,6 +167,35 @@ class Serializer(BaseSchema, metaclass=SchemaMeta):
                 self._data = None
         return self._data
 
+    @classmethod
+    def get_columns(
+        cls,
+        model: Any,
+        only: Optional[Iterable[str]] = None,
+        exclude: Iterable[str] = (),
+    ) -> List[Any]:
+        """Return the model fields needed to dump the selected fields.
+
+        Computed fields declare the columns they read through the
+        `columns` field argument, e.g. `fields.Method("get_name",
+        columns=("first_name", "last_name"))`.
+        """
+        meta = model._meta
+        columns = {x.name for x in meta.get_primary_keys()}
+        for name, field in cls._declared_fields.items():
+            if field.load_only or name in exclude:
+                continue
+            if only is not None and name not in only:
+                continue
+            sources = field.metadata.get("columns") \
+                or (field.attribute or name, )
+            for source in sources:
+                model_field = meta.fields.get(source) \
+                    or meta.columns.get(source)
+                if model_field is not None:
+                    columns.add(model_field.name)
+        return [x for x in meta.sorted_fields if x.name in columns]
+
     @property
     def errors(self) -> dict:
         assert hasattr(
@@ -0,0 +1,287 @@
+import asyncio
+import errno
+import os
+import signal
+import socket
+import time
+from typing import (
+    Any,
+    Awaitable,
+    Dict,
+    List,
+    Optional,
+    Set,
+)
+
+import tornado.web
+from tornado.httpserver import HTTPServer
+from tornado.httputil import (
+    HTTPHeaders,
+    HTTPMessageDelegate,
+    HTTPServerRequest,
+    RequestStartLine,
+)
+from tornado.ioloop import IOLoop
+from tornado.log import app_log
+from tornado.netutil import bind_sockets
+
+from tornado_restful.accesslog import close_access_logger, log_request
+from tornado_restful.conf import settings
+from tornado_restful.handlers import NotFoundHandler
+from tornado_restful.shortcuts import get_routes
+from tornado_restful.tasks import get_scheduler
+
+
+class Application(tornado.web.Application):
+    """Tracks the requests in progress so that workers can drain them.
+
+    A request counts from its headers until it is logged, or until its
+    connection drops before the body was received and no handler ran.
+    """
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.requests: Set[HTTPServerRequest] = set()
+
+    @property
+    def active_requests(self) -> int:
+        return len(self.requests)
+
+    def find_handler(
+        self, request: HTTPServerRequest, **kwargs: Any
+    ) -> HTTPMessageDelegate:
+        delegate = super().find_handler(request, **kwargs)
+        self.requests.add(request)
+        return _RequestDelegate(self, request, delegate)
+
+    def log_request(self, handler: tornado.web.RequestHandler) -> None:
+        self.requests.discard(handler.request)
+        super().log_request(handler)
+
+
+class _RequestDelegate(HTTPMessageDelegate):
+    def __init__(
+        self,
+        app: Application,
+        request: HTTPServerRequest,
+        delegate: HTTPMessageDelegate,
+    ) -> None:
+        self.app = app
+        self.request = request
+        self.delegate = delegate
+        self.received = False
+
+    def headers_received(
+        self, start_line: RequestStartLine, headers: HTTPHeaders
+    ) -> Optional[Awaitable[None]]:
+        return self.delegate.headers_received(start_line, headers)
+
+    def data_received(self, chunk: bytes) -> Optional[Awaitable[None]]:
+        return self.delegate.data_received(chunk)
+
+    def finish(self) -> None:
+        self.received = True
+        self.delegate.finish()
+
+    def on_connection_close(self) -> None:
+        if not self.received:
+            self.app.requests.discard(self.request)
+        self.delegate.on_connection_close()
+
+
+def make_app(
+    routes: List[tornado.web.URLSpec] = None, **kwargs: Any
+) -> Application:
+    kwargs.setdefault("debug", settings.debug)
+    kwargs.setdefault("default_handler_class", NotFoundHandler)
+    if settings.access_log_enabled:
+        kwargs.setdefault("log_function", log_request)
+    return Application(
+        handlers=get_routes() if routes is None else routes, **kwargs
+    )
+
+
+class Worker:
+    def __init__(
+        self,
+        app: Application,
+        sockets: List[socket.socket] = None,
+        port: int = None,
+        address: str = "",
+    ) -> None:
+        self.app = app
+        self.sockets = sockets
+        self.port = port
+        self.address = address
+        self.server = None
+
+    def run(self) -> None:
+        for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+            signal.signal(signum, signal.SIG_DFL)
+        io_loop = IOLoop.current()
+        io_loop.run_sync(self.setup)
+        signal.signal(
+            signal.SIGTERM,
+            lambda *args: io_loop.add_callback_from_signal(self.shutdown),
+        )
+        # Only the master reacts to terminal signals, it drains the workers.
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+        io_loop.start()
+
+    async def setup(self) -> None:
+        # The database is only touched after fork so that no connection (or
+        # pool) is ever shared between processes.
+        from tornado_restful.models import setup
+        self.app.db = setup()
+        if settings.mysql_dbname:
+            await self.app.db.connect()
+        sockets = self.sockets
+        if sockets is None:
+            sockets = bind_sockets(self.port, self.address, reuse_port=True)
+        self.server = HTTPServer(self.app, xheaders=settings.serve_xheaders)
+        self.server.add_sockets(sockets)
+
+    async def shutdown(self) -> None:
+        self.server.stop()
+        deadline = time.monotonic() + settings.serve_drain_timeout
+        while self.app.active_requests > 0 and time.monotonic() < deadline:
+            await asyncio.sleep(0.1)
+        await self.server.close_all_connections()
+        await get_scheduler().drain(settings.task_drain_timeout)
+        close_access_logger(settings.serve_drain_timeout)
+        if settings.mysql_dbname:
+            await self.app.db.close()
+        IOLoop.current().stop()
+
+
+class Master:
+    def __init__(
+        self,
+        port: int,
+        address: str = "",
+        workers: int = 0,
+        reuse_port: bool = False,
+        routes: List[tornado.web.URLSpec] = None,
+    ) -> None:
+        self.port = port
+        self.address = address
+        self.num_workers = workers or os.cpu_count() or 1
+        self.reuse_port = reuse_port
+        self.app = make_app(routes, autoreload=False)
+        self.sockets = None
+        self.workers: Dict[int, float] = {}
+        self.retiring = set()
+        self.signals = []
+        self.stopping = False
+        self.backoff = False
+
+    def run(self) -> None:
+        if not self.reuse_port:
+            self.sockets = bind_sockets(self.port, self.address)
+        for signum in (signal.SIGTERM, signal.SIGINT, signal.SIGHUP):
+            signal.signal(signum, self._handle_signal)
+        app_log.info(
+            "Master %d serving on %s:%d with %d workers", os.getpid(),
+            self.address or "*", self.port, self.num_workers
+        )
+        for _ in range(self.num_workers):
+            self.spawn()
+        while self.workers:
+            time.sleep(0.2)
+            self.reap()
+            while self.signals:
+                self._dispatch(self.signals.pop(0))
+            missing = self.num_workers - len(self.workers) + len(self.retiring)
+            if missing > 0 and not self.stopping:
+                if self.backoff:
+                    # Avoid a fork loop when workers crash right after start.
+                    time.sleep(1)
+                    self.backoff = False
+                for _ in range(missing):
+                    self.spawn()
+
+    def spawn(self) -> int:
+        pid = os.fork()
+        if pid == 0:
+            try:
+                Worker(self.app, self.sockets, self.port, self.address).run()
+            except Exception:
+                app_log.exception("Worker %d crashed", os.getpid())
+                os._exit(1)
+            os._exit(0)
+        self.workers[pid] = time.monotonic()
+        return pid
+
+    def reap(self) -> None:
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except OSError as e:
+                if e.errno == errno.ECHILD:
+                    return
+                raise
+            if pid == 0:
+                return
+            started = self.workers.pop(pid, None)
+            if pid in self.retiring:
+                self.retiring.discard(pid)
+                continue
+            if started and time.monotonic() - started < 1:
+                self.backoff = True
+            if not self.stopping and os.WIFSIGNALED(status):
+                app_log.warning(
+                    "Worker %d killed by signal %d, restarting", pid,
+                    os.WTERMSIG(status)
+                )
+            elif not self.stopping and os.WEXITSTATUS(status) != 0:
+                app_log.warning(
+                    "Worker %d exited with status %d, restarting", pid,
+                    os.WEXITSTATUS(status)
+                )
+
+    def reload(self) -> None:
+        # New workers are forked from the master and therefore reuse the
+        # preloaded settings and routes; restart the master to load new code.
+        old_workers = set(self.workers) - self.retiring
+        for _ in range(self.num_workers):
+            self.spawn()
+        self.retiring |= old_workers
+        self._kill(old_workers, signal.SIGTERM)
+
+    def stop(self) -> None:
+        self.stopping = True
+        self._kill(self.workers, signal.SIGTERM)
+
+    def _handle_signal(self, signum: int, frame: Any) -> None:
+        self.signals.append(signum)
+
+    def _dispatch(self, signum: int) -> None:
+        if signum == signal.SIGHUP:
+            app_log.info("Reloading workers")
+            self.reload()
+        elif not self.stopping:
+            app_log.info("Draining workers")
+            self.stop()
+
+    def _kill(self, pids: Any, signum: int) -> None:
+        for pid in list(pids):
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+
+def serve(
+    port: int = None,
+    address: str = None,
+    workers: int = None,
+    reuse_port: bool = None,
+) -> None:
+    Master(
+        port=settings.serve_port if port is None else port,
+        address=settings.serve_address if address is None else address,
+        workers=settings.serve_workers if workers is None else workers,
+        reuse_port=(
+            settings.serve_reuse_port if reuse_port is None else reuse_port
+        ),
+    ).run()
@@ -3,11 +3,9 @@ import os
 import re
 from datetime import datetime, timedelta
 from inspect import getmembers
-from passlib.hash import pbkdf2_sha256
 from types import ModuleType
 from typing import List, Optional, Union
 
-import jwt
 import tornado.web
 
 from tornado_restful.conf import settings
@@ -29,10 +27,16 @@ def _load_modules_from_spec_path(path: str) -> List[ModuleType]:
 
 
 def get_routes(
-    path: str = settings.routers_path,
-    api_prefix: str = settings.api_prefix,
-    trailing_slash: bool = settings.trailing_slash,
+    path: str = None,
+    api_prefix: str = None,
+    trailing_slash: bool = None,
 ) -> List[tornado.web.url]:
+    if path is None:
+        path = settings.routers_path
+    if api_prefix is None:
+        api_prefix = settings.api_prefix
+    if trailing_slash is None:
+        trailing_slash = settings.trailing_slash
     routes = []
     for module in _load_modules_from_spec_path(path):
         routers = [
@@ -66,8 +70,11 @@ def send_email(
 
 def generate_json_web_token(
     payload: dict,
-    expires_in: int = settings.jwt_expiration_delta,
+    expires_in: int = None,
 ) -> str:
+    import jwt
+    if expires_in is None:
+        expires_in = settings.jwt_expiration_delta
     payload["exp"] = datetime.utcnow() + timedelta(seconds=expires_in)
     token = jwt.encode(
         payload=payload,
@@ -81,6 +88,7 @@ def parse_json_web_token(
     token: str,
     verify_exp: bool = True,
 ) -> Optional[dict]:
+    import jwt
     try:
         payload = jwt.decode(
             jwt=token,
@@ -109,4 +117,5 @@ def decrypt(ciphertext: str) -> str:
 
 
 def verify_password(password, hashed):
+    from passlib.hash import pbkdf2_sha256
     return pbkdf2_sha256.verify(password, hashed)
@@ -0,0 +1,127 @@
+import asyncio
+import functools
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from inspect import isawaitable, iscoroutinefunction
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Optional,
+    Union,
+)
+
+from tornado.log import app_log
+
+from tornado_restful.conf import settings
+
+
+class TaskScheduler:
+    """Runs fire-and-forget work outside of the request/response cycle.
+
+    Coroutines run on the event loop with at most `max_concurrency` of them
+    at a time, plain callables run on a thread pool of `max_workers`. Each
+    kind has its own queue: submissions beyond `max_pending` unfinished
+    coroutines or `max_pending_sync` unfinished callables are dropped, so
+    a backlog of blocking work does not starve the coroutines.
+    """
+    def __init__(
+        self,
+        max_concurrency: int = 100,
+        max_pending: int = 10000,
+        max_workers: int = 4,
+        max_pending_sync: int = 1000,
+    ) -> None:
+        self.max_concurrency = max_concurrency
+        self.max_pending = max_pending
+        self.max_workers = max_workers
+        self.max_pending_sync = max_pending_sync
+        self.metrics = Counter()
+        self.tasks = set()
+        self.sync_tasks = set()
+        self._semaphore = None
+        self._executor = None
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return dict(
+            self.metrics,
+            pending=len(self.tasks),
+            pending_sync=len(self.sync_tasks),
+        )
+
+    def submit(
+        self, func: Union[Callable[..., Any], Any], *args: Any, **kwargs: Any
+    ) -> Optional[asyncio.Future]:
+        if asyncio.iscoroutine(func) or iscoroutinefunction(func):
+            tasks, max_pending, run = self.tasks, self.max_pending, self._run
+        else:
+            tasks, max_pending, run = (
+                self.sync_tasks, self.max_pending_sync, self._run_sync
+            )
+        if len(tasks) >= max_pending:
+            self.metrics["dropped"] += 1
+            if asyncio.iscoroutine(func):
+                func.close()
+            app_log.warning("Task queue is full, dropped %r", func)
+            return None
+        self.metrics["submitted"] += 1
+        task = asyncio.ensure_future(self._track(run, func, args, kwargs))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+        return task
+
+    async def drain(self, timeout: float = None) -> int:
+        pending = self.tasks | self.sync_tasks
+        if pending:
+            await asyncio.wait(list(pending), timeout=timeout)
+        pending = len(self.tasks) + len(self.sync_tasks)
+        if pending:
+            app_log.warning("%d deferred tasks did not finish", pending)
+        return pending
+
+    async def _track(
+        self, run: Callable[..., Any], func: Any, args: tuple, kwargs: dict
+    ) -> None:
+        try:
+            await run(func, args, kwargs)
+        except Exception:
+            self.metrics["failed"] += 1
+            app_log.exception("Deferred task %r failed", func)
+        else:
+            self.metrics["completed"] += 1
+
+    async def _run(self, func: Any, args: tuple, kwargs: dict) -> None:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            if asyncio.iscoroutine(func):
+                await func
+            else:
+                await func(*args, **kwargs)
+
+    async def _run_sync(self, func: Any, args: tuple, kwargs: dict) -> None:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                self.max_workers, thread_name_prefix="deferred"
+            )
+        result = await asyncio.get_event_loop().run_in_executor(
+            self._executor, functools.partial(func, *args, **kwargs)
+        )
+        if isawaitable(result):
+            await result
+
+
+_scheduler = None
+
+
+def get_scheduler() -> TaskScheduler:
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = TaskScheduler(
+            max_concurrency=settings.task_max_concurrency,
+            max_pending=settings.task_max_pending,
+            max_workers=settings.task_thread_pool_size,
+            max_pending_sync=settings.task_max_pending_sync,
+        )
+    return _scheduler
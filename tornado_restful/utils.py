@@ -9,8 +9,9 @@ from email.mime.text import MIMEText
 from types import TracebackType
 from typing import Optional, Type, Union
 
-from Crypto import Random
-from Crypto.Cipher import AES
+# `Crypto` is imported by the methods that need it, it is expensive to import
+# and most processes never encrypt anything.
+BLOCK_SIZE = 16
 
 
 class AESCipher:
@@ -18,14 +19,19 @@ class AESCipher:
         self.key = key
 
     def encrypt(self, plaintext: str) -> str:
+        from Crypto import Random
+        from Crypto.Cipher import AES
         plaintext = self._pad(plaintext)
         iv = Random.new().read(AES.block_size)
         cipher = AES.new(self.key, AES.MODE_CBC, iv)
-        b64ciphertext = base64.b64encode(iv + cipher.encrypt(plaintext))
+        b64ciphertext = base64.b64encode(
+            iv + cipher.encrypt(plaintext.encode("utf-8"))
+        )
         ciphertext = b64ciphertext.decode("utf-8")
         return ciphertext
 
     def decrypt(self, ciphertext: str) -> str:
+        from Crypto.Cipher import AES
         ciphertext = base64.b64decode(ciphertext.encode("utf-8"))
         iv = ciphertext[:AES.block_size]
         cipher = AES.new(self.key, AES.MODE_CBC, iv)
@@ -33,7 +39,7 @@ class AESCipher:
         return b64plaintext.decode("utf-8")
 
     def _pad(self, text: str) -> str:
-        pad_num = AES.block_size - (len(text) % AES.block_size)
+        pad_num = BLOCK_SIZE - (len(text) % BLOCK_SIZE)
         pad_char = chr(pad_num)
         return text + pad_char * pad_num
 